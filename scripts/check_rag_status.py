@@ -4,9 +4,21 @@ RAG Database Status Checker
 Quick script to check if ChromaDB is properly initialized
 """
 
+import asyncio
 import os
 import sys
 
+def _dir_size(path):
+    """Total size in bytes of all files under path (DirEntry stat data is reused from readdir)"""
+    total = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                total += _dir_size(entry.path)
+            else:
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
+
 def check_rag_status():
     """Check RAG database status"""
     print("🔍 RAG Database Status Check")
@@ -18,13 +30,7 @@ def check_rag_status():
         print(f"✅ ChromaDB directory found: {chroma_path}")
         
         # Get directory size
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(chroma_path):
-            for filename in filenames:
-                fp = os.path.join(dirpath, filename)
-                total_size += os.path.getsize(fp)
-        
-        size_mb = total_size / (1024 * 1024)
+        size_mb = _dir_size(chroma_path) / (1024 * 1024)
         print(f"📊 Database size: {size_mb:.1f} MB")
     else:
         print(f"❌ ChromaDB directory not found: {chroma_path}")
@@ -69,52 +75,52 @@ def check_rag_status():
         print(f"❌ Error connecting to RAG service: {e}")
         return False
 
+async def _probe_fastapi(base_url):
+    """Fire the health and RAG search probes concurrently over one client"""
+    import httpx
+    
+    async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+        return await asyncio.gather(
+            client.get("/health", timeout=5),
+            client.post("/rag/search", data={"query": "test search", "max_results": 1}),
+            return_exceptions=True
+        )
+
 def check_fastapi_rag_endpoints():
     """Check if FastAPI RAG endpoints are working"""
     print("\n🌐 FastAPI RAG Endpoints Check")
     print("-" * 35)
     
     try:
-        import requests
-        
-        base_url = "http://localhost:8000"
-        
-        # Check health endpoint
-        try:
-            response = requests.get(f"{base_url}/health", timeout=5)
-            if response.status_code == 200:
-                print("✅ FastAPI server is running")
-            else:
-                print(f"⚠️ FastAPI server responded with: {response.status_code}")
-        except:
-            print("❌ FastAPI server is not running")
-            print("💡 Start server: python fastapi_app.py")
-            return False
-        
-        # Test RAG search endpoint
-        try:
-            response = requests.post(
-                f"{base_url}/rag/search",
-                data={"query": "test search", "max_results": 1},
-                timeout=10
-            )
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✅ RAG search endpoint working")
-                print(f"📊 Search returned {result.get('total_results', 0)} results")
-            else:
-                print(f"❌ RAG search endpoint error: {response.status_code}")
-                print(f"📄 Response: {response.text}")
-                return False
-        except Exception as e:
-            print(f"❌ RAG search endpoint error: {e}")
-            return False
-        
-        return True
-        
+        health_response, search_response = asyncio.run(_probe_fastapi("http://localhost:8000"))
     except ImportError:
-        print("❌ requests library not available")
+        print("❌ httpx library not available")
         return False
+    
+    # Check health endpoint
+    if isinstance(health_response, Exception):
+        print("❌ FastAPI server is not running")
+        print("💡 Start server: python fastapi_app.py")
+        return False
+    if health_response.status_code == 200:
+        print("✅ FastAPI server is running")
+    else:
+        print(f"⚠️ FastAPI server responded with: {health_response.status_code}")
+    
+    # Test RAG search endpoint
+    if isinstance(search_response, Exception):
+        print(f"❌ RAG search endpoint error: {search_response}")
+        return False
+    if search_response.status_code == 200:
+        result = search_response.json()
+        print(f"✅ RAG search endpoint working")
+        print(f"📊 Search returned {result.get('total_results', 0)} results")
+    else:
+        print(f"❌ RAG search endpoint error: {search_response.status_code}")
+        print(f"📄 Response: {search_response.text}")
+        return False
+    
+    return True
 
 if __name__ == "__main__":
     print("🎫 Bangla Vai - RAG Status Checker")
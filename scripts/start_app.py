@@ -127,6 +127,12 @@ def start_fastapi():
     
     if settings.DEBUG:
         cmd.append("--reload")
+    else:
+        cmd.extend([
+            "--loop", "uvloop",
+            "--http", "httptools",
+            "--workers", str(settings.FASTAPI_WORKERS)
+        ])
     
     # Set environment variables for proper imports
     env = os.environ.copy()
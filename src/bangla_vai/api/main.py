@@ -1,42 +1,183 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, BackgroundTasks
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import os
+import io
+import asyncio
 import tempfile
 import time
-import json
+import secrets
+import threading
 from typing import Optional, List, Dict, Any
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import logging
 
 # Import from our new structure
 from ..core.config import settings
-from ..core.database import get_db, create_tables, Ticket, TicketStatus, TicketPriority, TicketCategory
+from ..core.database import (
+    get_async_db, get_ticket_batcher, create_tables, warm_async_pool, ticket_batcher, AsyncSessionLocal,
+    Ticket, TicketStatus, TicketPriority, TicketCategory, TicketInsertBatcher
+)
 from ..core.models import (
     TicketCreateRequest, TicketResponse, TicketListResponse, TicketCreateResponse,
     VoiceTicketRequest, VoiceProcessingResponse, TicketUpdateRequest, TicketUpdateResponse,
-    TicketDeleteResponse, TicketSearchRequest, TicketStatsResponse
+    TicketDeleteResponse, TicketSearchRequest, TicketStatsResponse, TicketJobStatusResponse
+)
+from ..services.speech_service import (
+    BengaliSTT, BengaliTTS, close_async_client, hash_audio_bytes, new_audio_hasher
 )
-from ..services.speech_service import BengaliSTT, BengaliTTS
 from ..services.ai_service import get_gemini_processor
-from ..services.ticket_service import get_intelligent_processor
+from ..services.ticket_service import (
+    get_intelligent_processor, CATEGORIES, PRIORITIES, PRODUCTS, SUBCATEGORIES
+)
 from ..services.rag_service import get_rag_service
 
-from sqlalchemy.orm import Session
-from datetime import datetime
+from sqlalchemy import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from datetime import datetime, timedelta
 import aiofiles
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Create database tables
-create_tables()
+# Bound concurrent calls to the paid speech / LLM backends so bursts queue here
+# instead of oversubscribing the provider quota
+STT_SEM = asyncio.Semaphore(settings.STT_MAX_CONCURRENCY)
+GEMINI_SEM = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+async def run_gemini(func, *args):
+    """Run a blocking Gemini-backed call in the thread pool, bounded by GEMINI_SEM"""
+    async with GEMINI_SEM:
+        return await asyncio.to_thread(func, *args)
+
+async def await_gemini(coro):
+    """Await a native async Gemini call, bounded by GEMINI_SEM"""
+    async with GEMINI_SEM:
+        return await coro
+
+# Value -> member lookups for the model enums, built once instead of calling Enum(value) per request
+_CATEGORY_BY_VALUE = {member.value: member for member in TicketCategory}
+_PRIORITY_BY_VALUE = {member.value: member for member in TicketPriority}
+_STATUS_BY_VALUE = {member.value: member for member in TicketStatus}
+
+# Enum values in declaration order, seeding the zero counts of the stats response
+ALL_STATUSES = tuple(_STATUS_BY_VALUE)
+ALL_PRIORITIES = tuple(_PRIORITY_BY_VALUE)
+ALL_CATEGORIES = tuple(_CATEGORY_BY_VALUE)
+
+def ticket_fields(**fields) -> Dict[str, Any]:
+    """Map category/priority/status string values to model enums (status defaults to open)"""
+    fields["category"] = _CATEGORY_BY_VALUE[fields["category"]]
+    fields["priority"] = _PRIORITY_BY_VALUE[fields["priority"]]
+    fields["status"] = _STATUS_BY_VALUE[fields.get("status", "open")]
+    return fields
+
+def build_ticket(**fields) -> Ticket:
+    """Single construction path for new tickets"""
+    return Ticket(**ticket_fields(**fields))
+
+# Ticket has no relationships today; fail fast if one is added and lazily loaded per row
+TICKET_LOAD_OPTIONS = [raiseload("*")]
+
+def _unique_file_id() -> str:
+    """Collision-free id for generated filenames (nanosecond clock + random suffix)"""
+    return f"{time.time_ns()}_{secrets.token_hex(3)}"
+
+# Directories for uploaded and generated audio and for attachments (created once at startup);
+# per-request paths are built with f-strings on the precomputed string form
+VOICES_DIR = Path(settings.VOICES_DIR)
+VOICES_PATH = str(VOICES_DIR)
+ATTACHMENTS_DIR = Path(settings.ATTACHMENTS_DIR)
+ATTACHMENTS_PATH = str(ATTACHMENTS_DIR)
+UPLOAD_PREFIX = "uploaded_audio_"
+
+# Accepted audio uploads for /stt/transcribe
+_ALLOWED_TYPES = frozenset({'audio/wav', 'audio/mpeg', 'audio/ogg', 'audio/mp4', 'audio/webm'})
+_ALLOWED_EXTS = frozenset(settings.ALLOWED_AUDIO_EXTENSIONS)
+
+def _file_extension(filename: Optional[str], default: str) -> str:
+    """Lowercased extension of an uploaded filename without the dot, or default if it has none"""
+    _, dot, tail = (filename or "").rpartition(".")
+    return tail.lower() if dot and tail else default
+
+# Upload read size when streaming request bodies to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+async def _stream_upload_to_disk(file: UploadFile, file_path: str, hasher=None):
+    """Copy an upload to disk in fixed-size chunks, optionally feeding each chunk to a hasher"""
+    async with aiofiles.open(file_path, "wb") as out_file:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if hasher is not None:
+                hasher.update(chunk)
+            await out_file.write(chunk)
+
+def _warm_ai_services():
+    """Build the Gemini and intelligent processors (model probing happens on construction) and the semantic cache encoder"""
+    if not settings.GOOGLE_API_KEY:
+        return
+    try:
+        get_intelligent_processor()
+        get_gemini_processor().warm_semantic_cache()
+    except Exception as e:
+        logger.warning(f"AI service warmup failed: {e}")
+
+def _warm_rag_service():
+    """Load the embedding model and ChromaDB collection, then run one embed and count"""
+    try:
+        rag_service = get_rag_service()
+        rag_service.encoder.encode(["warmup"])
+        rag_service.get_database_stats()
+    except Exception as e:
+        logger.warning(f"RAG service warmup failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    # Size the to_thread pool so every Gemini slot can block without starving other offloaded work
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(
+        max_workers=settings.GEMINI_MAX_CONCURRENCY + (os.cpu_count() or 1) + 4,
+        thread_name_prefix="bangla-vai"
+    ))
+    # Create database tables (blocking DDL, kept off the event loop)
+    await asyncio.to_thread(create_tables)
+    await warm_async_pool()
+    try:
+        await _recover_stale_tickets()
+    except Exception as e:
+        logger.warning(f"Stale ticket recovery failed: {e}")
+    VOICES_DIR.mkdir(parents=True, exist_ok=True)
+    ATTACHMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    # Warm the speech clients so the first request does not pay construction cost
+    get_tts_client()
+    if settings.ELEVENLABS_API_KEY:
+        try:
+            _stt_for(settings.ELEVENLABS_API_KEY)
+        except Exception as e:
+            logger.warning(f"STT client warmup failed: {e}")
+    # Load AI models and the RAG index up front instead of on the first unlucky request
+    await asyncio.gather(
+        asyncio.to_thread(_warm_ai_services),
+        asyncio.to_thread(_warm_rag_service)
+    )
+    ticket_batcher.start()
+    yield
+    await ticket_batcher.stop()
+    # Release pooled connections held by the shared STT HTTP client
+    await close_async_client()
 
 app = FastAPI(
     title=settings.APP_NAME,
     description="Bengali Voice-to-Ticket System with Speech Processing and AI Analysis",
-    version=settings.APP_VERSION
+    version=settings.APP_VERSION,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -48,103 +189,156 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize clients (will be created per request to avoid issues)
+# Compress larger JSON payloads (e.g. full Scribe results with word timings)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Speech clients are cached so their connection pools survive across requests
+@lru_cache(maxsize=4)
+def _stt_for(api_key: str) -> BengaliSTT:
+    """Build the STT client for an API key (cleared when the key changes)"""
+    return BengaliSTT()
+
 def get_stt_client():
     """Get STT client with API key validation"""
     if not settings.ELEVENLABS_API_KEY:
         raise HTTPException(status_code=400, detail="ELEVENLABS_API_KEY not configured")
-    return BengaliSTT()
+    return _stt_for(settings.ELEVENLABS_API_KEY)
+
+_tts_singleton: Optional[BengaliTTS] = None
+_tts_lock = threading.Lock()
 
 def get_tts_client():
     """Get TTS client"""
-    return BengaliTTS()
+    global _tts_singleton
+    if _tts_singleton is None:
+        with _tts_lock:
+            if _tts_singleton is None:
+                _tts_singleton = BengaliTTS()
+    return _tts_singleton
+
+# Static API index, serialized once at import time
+_ROOT_BODY = orjson.dumps({
+    "message": f"{settings.APP_NAME} - Bengali Voice-to-Ticket System",
+    "version": settings.APP_VERSION,
+    "status": "running",
+    "endpoints": {
+        # Speech processing endpoints
+        "transcribe": "/stt/transcribe - Upload audio file for Bengali speech-to-text", 
+        "text_to_speech": "/tts/convert - Convert Bengali text to speech",
+        "download_audio": "/tts/download/{timestamp} - Download generated speech file",
+        "list_files": "/files/list - List all uploaded audio files",
+        "config_api_key": "/config/api-key - Configure ElevenLabs API key",
+        "health": "/health - API health check",
+        # Ticketing endpoints
+        "create_ticket": "/tickets/create - Create a new ticket",
+        "voice_to_ticket": "/tickets/voice-to-ticket - Create ticket from Bengali voice",
+        "get_ticket": "/tickets/{ticket_id} - Get specific ticket",
+        "list_tickets": "/tickets - List all tickets with filters",
+        "update_ticket": "/tickets/{ticket_id} - Update ticket",
+        "delete_ticket": "/tickets/{ticket_id} - Delete ticket",
+        "ticket_stats": "/tickets/stats - Get ticket statistics",
+        "process_voice_complaint": "/process/voice-complaint - Process Bengali voice complaint",
+        "save_audio": "/save-audio - Save recorded audio file to voices folder",
+        "process_voice_with_attachment": "/process/voice-with-attachment - Process voice complaint with attachment"
+    }
+})
 
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": f"{settings.APP_NAME} - Bengali Voice-to-Ticket System",
-        "version": settings.APP_VERSION,
-        "status": "running",
-        "endpoints": {
-            # Speech processing endpoints
-            "transcribe": "/stt/transcribe - Upload audio file for Bengali speech-to-text", 
-            "text_to_speech": "/tts/convert - Convert Bengali text to speech",
-            "download_audio": "/tts/download/{timestamp} - Download generated speech file",
-            "list_files": "/files/list - List all uploaded audio files",
-            "config_api_key": "/config/api-key - Configure ElevenLabs API key",
-            "health": "/health - API health check",
-            # Ticketing endpoints
-            "create_ticket": "/tickets/create - Create a new ticket",
-            "voice_to_ticket": "/tickets/voice-to-ticket - Create ticket from Bengali voice",
-            "get_ticket": "/tickets/{ticket_id} - Get specific ticket",
-            "list_tickets": "/tickets - List all tickets with filters",
-            "update_ticket": "/tickets/{ticket_id} - Update ticket",
-            "delete_ticket": "/tickets/{ticket_id} - Delete ticket",
-            "ticket_stats": "/tickets/stats - Get ticket statistics",
-            "process_voice_complaint": "/process/voice-complaint - Process Bengali voice complaint",
-            "save_audio": "/save-audio - Save recorded audio file to voices folder",
-            "process_voice_with_attachment": "/process/voice-with-attachment - Process voice complaint with attachment"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+# Static health body, serialized once; load balancers only look at the status code
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "version": settings.APP_VERSION,
+    "database": "connected"
+})
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy", 
-        "timestamp": time.time(),
-        "version": settings.APP_VERSION,
-        "database": "connected"
-    }
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 @app.post("/stt/transcribe")
 async def transcribe_audio(
     file: UploadFile = File(..., description="Audio file to transcribe"),
-    language: str = Form("bengali", description="Language for transcription")
+    language: str = Form("bengali", description="Language for transcription"),
+    include_full: bool = Form(False, description="Include the full Scribe result (word timestamps) in the response"),
+    persist: bool = Form(True, description="Keep a copy of the uploaded audio in the voices directory")
 ):
     """
     Transcribe audio file to Bengali text using ElevenLabs Scribe API
     
     - **file**: Audio file (supported formats: wav, mp3, ogg, m4a, webm)
     - **language**: Language for transcription (default: bengali)
+    - **include_full**: Include the raw Scribe result in the response (default: False)
+    - **persist**: Save the upload to the voices directory (default: True); when False the
+      upload is streamed straight to the STT API without a disk round-trip
     """
     try:
         # Validate file type
-        allowed_types = ['audio/wav', 'audio/mpeg', 'audio/ogg', 'audio/mp4', 'audio/webm']
-        if file.content_type not in allowed_types:
-            # Also check file extension as fallback
-            allowed_extensions = ['.wav', '.mp3', '.ogg', '.m4a', '.webm']
-            if not any(file.filename.lower().endswith(ext) for ext in allowed_extensions):
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Unsupported file type. Supported types: {allowed_extensions}"
-                )
-        
-        # Create voices directory if it doesn't exist
-        voices_dir = settings.VOICES_DIR
-        if not os.path.exists(voices_dir):
-            os.makedirs(voices_dir, exist_ok=True)
-        
-        # Generate timestamp for unique filename
-        timestamp = int(time.time())
-        file_extension = file.filename.split(".")[-1] if "." in file.filename else "wav"
-        saved_filename = f"uploaded_audio_{timestamp}.{file_extension}"
-        saved_file_path = os.path.join(voices_dir, saved_filename)
-        
-        # Save uploaded file to voices directory
-        content = await file.read()
-        with open(saved_file_path, "wb") as f:
-            f.write(content)
+        # Extension check first (set lookup), content type only as fallback
+        file_extension = _file_extension(file.filename, "")
+        if f".{file_extension}" not in _ALLOWED_EXTS and file.content_type not in _ALLOWED_TYPES:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Unsupported file type. Supported types: {settings.ALLOWED_AUDIO_EXTENSIONS}"
+            )
+        
+        saved_filename = None
+        saved_file_path = None
+        # Uploads up to one chunk are still held in Starlette's in-memory spool
+        spooled = file.size is not None and file.size <= UPLOAD_CHUNK_SIZE
+        
+        if persist:
+            # Generate unique filename (safe for concurrent uploads)
+            unique_id = _unique_file_id()
+            saved_filename = f"{UPLOAD_PREFIX}{unique_id}.{file_extension or 'wav'}"
+            saved_file_path = f"{VOICES_PATH}/{saved_filename}"
+            
+            if spooled:
+                # Transcribe straight from memory first, archive to disk afterwards
+                audio_bytes = await file.read()
+                content_hash = hash_audio_bytes(audio_bytes)
+            else:
+                # Stream uploaded file to voices directory in fixed-size chunks,
+                # hashing as we go so the transcription cache needs no extra pass
+                hasher = new_audio_hasher()
+                await _stream_upload_to_disk(file, saved_file_path, hasher)
+                content_hash = hasher.hexdigest()
         
         try:
             # Initialize STT client
             stt = get_stt_client()
             
-            # Transcribe the audio
-            result = stt.transcribe_audio_file(saved_file_path, language)
+            # Transcribe the audio without blocking the event loop
+            async with STT_SEM:
+                if persist and spooled:
+                    result = await stt.atranscribe_fileobj(
+                        io.BytesIO(audio_bytes), file.filename, language,
+                        content_hash=content_hash, content_type=file.content_type
+                    )
+                elif persist:
+                    # Files on disk can be split into parallel chunks when long
+                    result = await stt.atranscribe_audio_file(saved_file_path, language, content_hash=content_hash)
+                else:
+                    # Send the upload spool (in memory below spool_max_size) directly
+                    await file.seek(0)
+                    result = await stt.atranscribe_fileobj(
+                        file.file, file.filename, language, content_type=file.content_type
+                    )
             
             if result:
+                if persist and spooled:
+                    # Archiving is best effort and must not fail a finished transcription
+                    try:
+                        async with aiofiles.open(saved_file_path, "wb") as out_file:
+                            await out_file.write(audio_bytes)
+                    except Exception as e:
+                        logger.error(f"Error archiving upload {saved_filename}: {str(e)}")
+                        saved_filename = saved_file_path = None
+                
                 # Extract transcription text
                 if 'text' in result:
                     transcription_text = result['text']
@@ -153,25 +347,28 @@ async def transcribe_audio(
                 else:
                     transcription_text = str(result)
                 
-                return {
+                response_data = {
                     "success": True,
                     "transcription": transcription_text,
                     "language_code": result.get('language_code', 'unknown'),
                     "language_probability": result.get('language_probability', 0),
-                    "full_result": result,
                     "filename": file.filename,
                     "saved_as": saved_filename,
-                    "saved_path": saved_file_path
+                    "saved_path": saved_file_path,
+                    "cached": result.get('cached', False)
                 }
+                if include_full:
+                    response_data["full_result"] = result
+                return response_data
             else:
                 raise HTTPException(status_code=500, detail="Transcription failed")
                 
         except Exception as transcription_error:
-            # If transcription fails, we still keep the uploaded file
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Transcription failed: {str(transcription_error)}. File saved as: {saved_filename}"
-            )
+            # If transcription fails, we still keep a streamed upload (spooled ones are only archived on success)
+            detail = f"Transcription failed: {str(transcription_error)}."
+            if saved_filename and not spooled:
+                detail += f" File saved as: {saved_filename}"
+            raise HTTPException(status_code=500, detail=detail)
                 
     except HTTPException:
         raise
@@ -198,41 +395,33 @@ async def convert_text_to_speech(
         # Initialize TTS client
         tts = get_tts_client()
         
-        # Generate timestamp for unique filename
-        timestamp = int(time.time())
+        # Generate unique id for the filename (safe for concurrent requests)
+        timestamp = _unique_file_id()
         
         if return_file:
-            # Create voices directory if it doesn't exist
-            voices_dir = settings.VOICES_DIR
-            if not os.path.exists(voices_dir):
-                os.makedirs(voices_dir, exist_ok=True)
-            
-            output_filename = f"bengali_speech_{timestamp}.mp3"
-            output_path = os.path.join(voices_dir, output_filename)
-        else:
-            output_path = None
+            # Send the MP3 straight from memory, no write + read back through voices/
+            audio_bytes = await tts.asynthesize(text, slow=slow)
+            if not audio_bytes:
+                raise HTTPException(status_code=500, detail="Speech generation failed")
+            return Response(
+                content=audio_bytes,
+                media_type='audio/mpeg',
+                headers={"Content-Disposition": f'attachment; filename="bengali_speech_{timestamp}.mp3"'}
+            )
         
-        # Convert text to speech
-        audio_path = tts.text_to_speech(text, output_path, slow=slow)
+        # Convert text to speech (sentences are synthesized concurrently)
+        audio_path = await tts.atext_to_speech(text, slow=slow)
         
         if audio_path and os.path.exists(audio_path):
-            if return_file:
-                # Return file for download
-                return FileResponse(
-                    path=audio_path,
-                    media_type='audio/mpeg',
-                    filename=f"bengali_speech_{timestamp}.mp3"
-                )
-            else:
-                # Return file path and metadata
-                return {
-                    "success": True,
-                    "message": "Speech generated successfully",
-                    "audio_path": audio_path,
-                    "text": text,
-                    "slow": slow,
-                    "timestamp": timestamp
-                }
+            # Return file path and metadata
+            return {
+                "success": True,
+                "message": "Speech generated successfully",
+                "audio_path": audio_path,
+                "text": text,
+                "slow": slow,
+                "timestamp": timestamp
+            }
         else:
             raise HTTPException(status_code=500, detail="Speech generation failed")
             
@@ -242,24 +431,27 @@ async def convert_text_to_speech(
         raise HTTPException(status_code=500, detail=f"Error during text-to-speech conversion: {str(e)}")
 
 @app.get("/tts/download/{timestamp}")
-async def download_speech_file(timestamp: int):
+async def download_speech_file(timestamp: str):
     """
     Download generated speech file by timestamp
     
-    - **timestamp**: Timestamp of the generated file
+    - **timestamp**: Unique id returned as `timestamp` by /tts/convert
     """
     try:
-        voices_dir = settings.VOICES_DIR
         filename = f"bengali_speech_{timestamp}.mp3"
-        file_path = os.path.join(voices_dir, filename)
+        file_path = f"{VOICES_PATH}/{filename}"
         
-        if not os.path.exists(file_path):
+        # A single stat both checks existence and gives FileResponse its Content-Length
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Audio file not found")
         
         return FileResponse(
             path=file_path,
             media_type='audio/mpeg',
-            filename=filename
+            filename=filename,
+            stat_result=stat_result
         )
         
     except HTTPException:
@@ -267,35 +459,35 @@ async def download_speech_file(timestamp: int):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error downloading file: {str(e)}")
 
+def _scan_voices(voices_dir: str) -> List[Dict[str, Any]]:
+    """Collect uploaded audio files in voices_dir, most recent first"""
+    with os.scandir(voices_dir) as entries:
+        uploads = [
+            (entry.name, entry.stat()) for entry in entries
+            if entry.name.startswith(UPLOAD_PREFIX) and entry.is_file()
+        ]
+    
+    # Sort by creation time (most recent first) before building the response dicts
+    uploads.sort(key=lambda item: item[1].st_ctime, reverse=True)
+    
+    return [
+        {
+            "filename": name,
+            "size_bytes": file_stats.st_size,
+            "created_time": file_stats.st_ctime,
+            "modified_time": file_stats.st_mtime
+        }
+        for name, file_stats in uploads
+    ]
+
 @app.get("/files/list")
 async def list_uploaded_files():
     """
     List all uploaded audio files in the voices directory
     """
     try:
-        voices_dir = settings.VOICES_DIR
-        if not os.path.exists(voices_dir):
-            return {
-                "success": True,
-                "files": [],
-                "message": "No files uploaded yet"
-            }
-        
-        files = []
-        for filename in os.listdir(voices_dir):
-            if filename.startswith("uploaded_audio_"):
-                file_path = os.path.join(voices_dir, filename)
-                file_stats = os.stat(file_path)
-                files.append({
-                    "filename": filename,
-                    "size_bytes": file_stats.st_size,
-                    "size_mb": round(file_stats.st_size / (1024 * 1024), 2),
-                    "created_time": file_stats.st_ctime,
-                    "modified_time": file_stats.st_mtime
-                })
-        
-        # Sort by creation time (most recent first)
-        files.sort(key=lambda x: x["created_time"], reverse=True)
+        # Directory scan is blocking I/O, keep it off the event loop
+        files = await asyncio.to_thread(_scan_voices, VOICES_PATH)
         
         return {
             "success": True,
@@ -317,12 +509,14 @@ async def set_api_key(api_key: str = Form(..., description="ElevenLabs API key")
         if not api_key.strip():
             raise HTTPException(status_code=400, detail="API key cannot be empty")
         
-        # Set environment variable
+        # Set environment variable and drop the client cached for the old key
         os.environ["ELEVENLABS_API_KEY"] = api_key.strip()
+        settings.ELEVENLABS_API_KEY = api_key.strip()
+        _stt_for.cache_clear()
         
         # Test the API key by initializing the client
         try:
-            stt = BengaliSTT()
+            stt = get_stt_client()
             return {
                 "success": True,
                 "message": "API key configured successfully"
@@ -342,59 +536,61 @@ async def set_api_key(api_key: str = Form(..., description="ElevenLabs API key")
 @app.post("/tickets/create", response_model=TicketCreateResponse)
 async def create_ticket(
     ticket_data: TicketCreateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    batcher: TicketInsertBatcher = Depends(get_ticket_batcher)
 ):
     """
     Create a new support ticket
     """
     try:
         # Create new ticket
-        new_ticket = Ticket(
+        values = ticket_fields(
             title=ticket_data.title,
             description=ticket_data.description,
             customer_name=ticket_data.customer_name,
             customer_email=ticket_data.customer_email,
             customer_phone=ticket_data.customer_phone,
-            category=TicketCategory(ticket_data.category.value),
-            priority=TicketPriority(ticket_data.priority.value),
-            status=TicketStatus.OPEN
+            category=ticket_data.category.value,
+            priority=ticket_data.priority.value
         )
         
-        db.add(new_ticket)
-        db.commit()
-        db.refresh(new_ticket)
+        if batcher.running:
+            # Coalesced with concurrent creates into one INSERT ... RETURNING
+            row = await batcher.submit(values)
+            ticket = TicketResponse.model_validate(row._mapping)
+        else:
+            new_ticket = Ticket(**values)
+            db.add(new_ticket)
+            await db.commit()
+            await db.refresh(new_ticket)
+            ticket = TicketResponse.model_validate(new_ticket)
         
         return TicketCreateResponse(
             success=True,
-            message=f"Ticket #{new_ticket.id} created successfully",
-            ticket=TicketResponse.from_orm(new_ticket)
+            message=f"Ticket #{ticket.id} created successfully",
+            ticket=ticket
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating ticket: {str(e)}")
 
 @app.post("/tickets/voice-to-ticket", response_model=VoiceProcessingResponse)
 async def create_ticket_from_voice(
     voice_data: VoiceTicketRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a ticket from Bengali voice complaint using AI processing
     """
     try:
-        # Process Bengali text with Gemini AI
+        # Analyze the Bengali text and write the description in a single Gemini call
         gemini = get_gemini_processor()
-        ai_analysis = gemini.process_bengali_complaint(voice_data.bengali_text)
-        
-        # Enhance the description
-        enhanced_description = gemini.enhance_ticket_description(
-            ai_analysis["english_translation"],
-            ai_analysis["key_points"]
-        )
+        ai_analysis = await await_gemini(gemini.aprocess_full_ticket(voice_data.bengali_text))
+        enhanced_description = ai_analysis["enhanced_description"]
         
         # Create ticket from AI analysis
-        new_ticket = Ticket(
+        new_ticket = build_ticket(
             title=ai_analysis["title"],
             description=enhanced_description,
             bengali_description=voice_data.bengali_text,
@@ -402,14 +598,13 @@ async def create_ticket_from_voice(
             customer_name=voice_data.customer_name,
             customer_email=voice_data.customer_email,
             customer_phone=voice_data.customer_phone,
-            category=TicketCategory(ai_analysis["category"]),
-            priority=TicketPriority(ai_analysis["priority"]),
-            status=TicketStatus.OPEN
+            category=ai_analysis["category"],
+            priority=ai_analysis["priority"]
         )
         
         db.add(new_ticket)
-        db.commit()
-        db.refresh(new_ticket)
+        await db.commit()
+        await db.refresh(new_ticket)
         
         return VoiceProcessingResponse(
             success=True,
@@ -417,87 +612,203 @@ async def create_ticket_from_voice(
             bengali_text=voice_data.bengali_text,
             english_translation=ai_analysis["english_translation"],
             ai_analysis=ai_analysis,
-            ticket=TicketResponse.from_orm(new_ticket)
+            ticket=TicketResponse.model_validate(new_ticket)
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating voice ticket: {str(e)}")
 
+async def _transcribe_bengali(stt: BengaliSTT, audio_path: str, content_hash: str):
+    """Transcribe a saved complaint clip, returning the STT result and its non-empty Bengali text"""
+    async with STT_SEM:
+        transcription_result = await stt.atranscribe_audio_file(audio_path, "bengali", content_hash=content_hash)
+    
+    if not transcription_result:
+        raise HTTPException(status_code=500, detail="Audio transcription failed")
+    
+    bengali_text = transcription_result.get('text', '') or transcription_result.get('transcription', '')
+    
+    if not bengali_text.strip():
+        raise HTTPException(status_code=400, detail="No speech detected in audio")
+    
+    return transcription_result, bengali_text
+
+async def _create_processing_ticket(db: AsyncSession, **fields) -> Ticket:
+    """Insert a placeholder ticket that a background voice job fills in"""
+    ticket = build_ticket(
+        title="Voice complaint (processing)",
+        description="Voice complaint is being transcribed and analyzed",
+        category="general",
+        priority="medium",
+        status="processing",
+        **fields
+    )
+    db.add(ticket)
+    await db.commit()
+    await db.refresh(ticket)
+    return ticket
+
+def _failed_ticket_fields(detail: str) -> dict:
+    """Fields that reopen a background ticket for manual handling with the failure reason"""
+    return {
+        "status": TicketStatus.OPEN,
+        "title": "Voice complaint (processing failed)",
+        "description": f"Automatic processing failed: {detail}"
+    }
+
+async def _write_ticket_fields(ticket_id: int, values: dict):
+    """Update a ticket row in a fresh session"""
+    async with AsyncSessionLocal() as db:
+        await db.execute(update(Ticket).where(Ticket.id == ticket_id).values(**values, updated_at=datetime.utcnow()))
+        await db.commit()
+
+async def _run_ticket_job(ticket_id: int, job):
+    """Run a background voice job and write its ticket fields onto the placeholder row"""
+    failed = False
+    try:
+        values = ticket_fields(**await job())
+    except Exception as e:
+        # Keep the complaint: reopen it for manual handling with the failure reason
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Background processing for ticket #{ticket_id} failed: {detail}")
+        values = _failed_ticket_fields(detail)
+        failed = True
+    
+    # Retry the write once, then fall back to reopening the ticket so it never stays in processing
+    attempts = [values, values]
+    if not failed:
+        attempts.append(_failed_ticket_fields("could not save the processed ticket"))
+    for attempt, attempt_values in enumerate(attempts, 1):
+        try:
+            await _write_ticket_fields(ticket_id, attempt_values)
+            return
+        except Exception as e:
+            logger.error(f"Saving background result for ticket #{ticket_id} failed (attempt {attempt}/{len(attempts)}): {str(e)}")
+            if attempt < len(attempts):
+                await asyncio.sleep(0.5 * attempt)
+    logger.error(f"Ticket #{ticket_id} is left in processing status")
+
+# Background jobs die with their worker process; processing tickets untouched for this long are orphaned
+STALE_PROCESSING_AFTER = timedelta(minutes=30)
+
+async def _recover_stale_tickets():
+    """Reopen processing tickets whose background job was lost to a restart"""
+    cutoff = datetime.utcnow() - STALE_PROCESSING_AFTER
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(Ticket)
+            .where(Ticket.status == TicketStatus.PROCESSING,
+                   func.coalesce(Ticket.updated_at, Ticket.created_at) < cutoff)
+            .values(**_failed_ticket_fields("interrupted by a server restart"), updated_at=datetime.utcnow())
+        )
+        await db.commit()
+    if result.rowcount:
+        logger.warning(f"Reopened {result.rowcount} ticket(s) left in processing by a previous run")
+
+def _accepted(ticket: Ticket) -> ORJSONResponse:
+    """202 response pointing the client at the status endpoint of a background ticket"""
+    return ORJSONResponse({
+        "success": True,
+        "message": f"Voice complaint accepted, ticket #{ticket.id} is being processed",
+        "ticket_id": ticket.id,
+        "status_url": f"/tickets/{ticket.id}/status"
+    }, status_code=202)
+
+async def _analyze_voice_complaint(bengali_text: str):
+    """Intelligent-processor analysis of a complaint, returned with the ticket fields it produces"""
+    intelligent_processor = get_intelligent_processor()
+    extracted_data = await await_gemini(intelligent_processor.aprocess_bengali_voice_input(bengali_text))
+    
+    # Use the intelligent processor's structured description if available,
+    # otherwise get an enhanced description from Gemini
+    if extracted_data["description"]:
+        enhanced_description = extracted_data["description"]
+    else:
+        gemini = get_gemini_processor()
+        enhanced_description = await await_gemini(gemini.aenhance_ticket_description(
+            extracted_data["ai_analysis"].get("english_translation", ""),
+            extracted_data["ai_analysis"].get("key_points", [])
+        ))
+    
+    fields = dict(
+        title=extracted_data["title"],
+        description=enhanced_description,
+        bengali_description=bengali_text,
+        category=extracted_data["category"],
+        subcategory=extracted_data["subcategory"],
+        product=extracted_data["product"],
+        priority=extracted_data["priority"]
+    )
+    return extracted_data, fields
+
 @app.post("/process/voice-complaint")
 async def process_voice_complaint(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="Bengali audio file"),
     customer_name: str = Form(..., description="Customer name"),
     customer_email: Optional[str] = Form(None, description="Customer email"),
     customer_phone: Optional[str] = Form(None, description="Customer phone"),
-    db: Session = Depends(get_db)
+    background: bool = Form(False, description="Return 202 immediately and process in the background"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Complete voice-to-ticket pipeline: transcribe Bengali audio → AI analysis → create ticket
+    
+    With background=true the upload is saved, a ticket is created in the "processing" state
+    and the response returns at once; poll /tickets/{id}/status for completion.
     """
     try:
         # Step 1: Transcribe audio
-        voices_dir = "voices"
-        if not os.path.exists(voices_dir):
-            os.makedirs(voices_dir)
-        
-        timestamp = int(time.time())
-        file_extension = file.filename.split(".")[-1] if "." in file.filename else "wav"
+        timestamp = _unique_file_id()
+        file_extension = _file_extension(file.filename, "wav")
         saved_filename = f"complaint_audio_{timestamp}.{file_extension}"
-        saved_file_path = os.path.join(voices_dir, saved_filename)
-        
-        content = await file.read()
-        with open(saved_file_path, "wb") as f:
-            f.write(content)
+        saved_file_path = f"{VOICES_PATH}/{saved_filename}"
         
-        # Transcribe audio
         stt = get_stt_client()
-        transcription_result = stt.transcribe_audio_file(saved_file_path, "bengali")
-        
-        if not transcription_result:
-            raise HTTPException(status_code=500, detail="Audio transcription failed")
-        
-        bengali_text = transcription_result.get('text', '') or transcription_result.get('transcription', '')
+        # Hash while streaming so a re-uploaded clip is answered from the transcription cache
+        hasher = new_audio_hasher()
+        await _stream_upload_to_disk(file, saved_file_path, hasher)
+        content_hash = hasher.hexdigest()
+        
+        if background:
+            ticket = await _create_processing_ticket(
+                db,
+                audio_file_path=saved_file_path,
+                customer_name=customer_name,
+                customer_email=customer_email,
+                customer_phone=customer_phone
+            )
+            
+            async def job():
+                _, bengali_text = await _transcribe_bengali(stt, saved_file_path, content_hash)
+                _, fields = await _analyze_voice_complaint(bengali_text)
+                return fields
+            
+            background_tasks.add_task(_run_ticket_job, ticket.id, job)
+            return _accepted(ticket)
         
-        if not bengali_text.strip():
-            raise HTTPException(status_code=400, detail="No speech detected in audio")
+        # Transcribe audio without blocking the event loop
+        transcription_result, bengali_text = await _transcribe_bengali(stt, saved_file_path, content_hash)
         
         # Step 2: Process with Intelligent AI Pipeline
-        intelligent_processor = get_intelligent_processor()
-        extracted_data = intelligent_processor.process_bengali_voice_input(bengali_text)
-        
-        # Get enhanced description from Gemini
-        gemini = get_gemini_processor()
-        enhanced_description = gemini.enhance_ticket_description(
-            extracted_data["ai_analysis"].get("english_translation", ""),
-            extracted_data["ai_analysis"].get("key_points", [])
-        )
-        
-        # Use the intelligent processor's structured description if available
-        if extracted_data["description"]:
-            enhanced_description = extracted_data["description"]
+        extracted_data, fields = await _analyze_voice_complaint(bengali_text)
         
         # Step 3: Create ticket with intelligent processing results
-        new_ticket = Ticket(
-            title=extracted_data["title"],
-            description=enhanced_description,
-            bengali_description=bengali_text,
+        new_ticket = build_ticket(
             audio_file_path=saved_file_path,
             customer_name=customer_name,
             customer_email=customer_email,
             customer_phone=customer_phone,
-            category=TicketCategory(extracted_data["category"]),
-            subcategory=extracted_data["subcategory"],
-            product=extracted_data["product"],
-            priority=TicketPriority(extracted_data["priority"]),
-            status=TicketStatus.OPEN
+            **fields
         )
         
         db.add(new_ticket)
-        db.commit()
-        db.refresh(new_ticket)
+        await db.commit()
+        await db.refresh(new_ticket)
         
-        return {
+        # Plain dicts serialized by orjson directly, skipping jsonable_encoder
+        return ORJSONResponse({
             "success": True,
             "message": f"Voice complaint processed and ticket #{new_ticket.id} created",
             "transcription": {
@@ -516,25 +827,86 @@ async def process_voice_complaint(
                 "urgency_indicators": extracted_data["urgency_indicators"]
             },
             "ai_analysis": extracted_data["ai_analysis"],
-            "ticket": TicketResponse.from_orm(new_ticket)
-        }
+            "ticket": TicketResponse.model_validate(new_ticket).model_dump()
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error processing voice complaint: {str(e)}")
 
+# Declared before /tickets/{ticket_id}, which would otherwise match "stats" as an id
+@app.get("/tickets/stats", response_model=TicketStatsResponse)
+async def get_ticket_stats(db: AsyncSession = Depends(get_async_db)):
+    """
+    Get ticket statistics
+    """
+    try:
+        # One GROUP BY over all three dimensions (at most |status| x |priority| x |category| rows),
+        # folded into the per-dimension counts in Python
+        rows = await db.execute(
+            select(Ticket.status, Ticket.priority, Ticket.category, func.count())
+            .group_by(Ticket.status, Ticket.priority, Ticket.category)
+        )
+        
+        total_tickets = 0
+        by_status = dict.fromkeys(ALL_STATUSES, 0)
+        by_priority = dict.fromkeys(ALL_PRIORITIES, 0)
+        by_category = dict.fromkeys(ALL_CATEGORIES, 0)
+        for status, priority, category, count in rows:
+            total_tickets += count
+            if status is not None:
+                by_status[status.value] += count
+            if priority is not None:
+                by_priority[priority.value] += count
+            if category is not None:
+                by_category[category.value] += count
+        
+        return TicketStatsResponse(
+            total_tickets=total_tickets,
+            open_tickets=by_status["open"],
+            in_progress_tickets=by_status["in_progress"],
+            resolved_tickets=by_status["resolved"],
+            closed_tickets=by_status["closed"],
+            urgent_tickets=by_priority["urgent"],
+            high_priority_tickets=by_priority["high"],
+            by_category=by_category,
+            by_priority=by_priority,
+            by_status=by_status
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting ticket stats: {str(e)}")
+
 @app.get("/tickets/{ticket_id}", response_model=TicketResponse)
-async def get_ticket(ticket_id: int, db: Session = Depends(get_db)):
+async def get_ticket(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get a specific ticket by ID
     """
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.get(Ticket, ticket_id, options=TICKET_LOAD_OPTIONS)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
-    return TicketResponse.from_orm(ticket)
+    return TicketResponse.model_validate(ticket)
+
+@app.get("/tickets/{ticket_id}/status", response_model=TicketJobStatusResponse)
+async def get_ticket_status(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Lightweight polling endpoint for tickets created with background=true
+    """
+    row = (await db.execute(
+        select(Ticket.status, Ticket.updated_at).where(Ticket.id == ticket_id)
+    )).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    return TicketJobStatusResponse(
+        ticket_id=ticket_id,
+        status=row.status.value,
+        processing=row.status is TicketStatus.PROCESSING,
+        updated_at=row.updated_at
+    )
 
 @app.get("/tickets", response_model=TicketListResponse)
 async def list_tickets(
@@ -544,31 +916,47 @@ async def list_tickets(
     customer_name: Optional[str] = None,
     limit: int = 10,
     offset: int = 0,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List tickets with optional filters
     """
-    query = db.query(Ticket)
-    
     # Apply filters
+    filters = []
     if status:
-        query = query.filter(Ticket.status == TicketStatus(status))
+        filters.append(Ticket.status == TicketStatus(status))
     if priority:
-        query = query.filter(Ticket.priority == TicketPriority(priority))
+        filters.append(Ticket.priority == TicketPriority(priority))
     if category:
-        query = query.filter(Ticket.category == TicketCategory(category))
+        filters.append(Ticket.category == TicketCategory(category))
     if customer_name:
-        query = query.filter(Ticket.customer_name.ilike(f"%{customer_name}%"))
+        if "%" in customer_name:
+            # Explicit pattern (e.g. "%rahim%"): served by the trigram index on Postgres
+            filters.append(Ticket.customer_name.ilike(customer_name))
+        else:
+            # Case-insensitive prefix match, served by the lower(customer_name) index
+            prefix = customer_name.lower().replace("\\", "\\\\").replace("_", "\\_")
+            filters.append(func.lower(Ticket.customer_name).like(f"{prefix}%", escape="\\"))
     
-    # Get total count
-    total = query.count()
+    # Page and total count in one query via a window count over the filtered rows.
+    # Plain columns skip ORM identity-map bookkeeping; rows validate straight from their mappings.
+    rows = (await db.execute(
+        select(*Ticket.__table__.columns, func.count().over().label("total"))
+        .where(*filters)
+        .offset(offset)
+        .limit(limit)
+    )).all()
     
-    # Apply pagination and get results
-    tickets = query.offset(offset).limit(limit).all()
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # Page past the end: no row carries the window count
+        total = await db.scalar(select(func.count()).select_from(Ticket).where(*filters))
+    else:
+        total = 0
     
     return TicketListResponse(
-        tickets=[TicketResponse.from_orm(ticket) for ticket in tickets],
+        tickets=[TicketResponse.model_validate(row._mapping) for row in rows],
         total=total,
         limit=limit,
         offset=offset
@@ -578,59 +966,60 @@ async def list_tickets(
 async def update_ticket(
     ticket_id: int,
     update_data: TicketUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update a ticket
     """
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
-    if not ticket:
-        raise HTTPException(status_code=404, detail="Ticket not found")
+    # Only the background voice job may put a ticket into processing
+    if update_data.status is not None and update_data.status.value == "processing":
+        raise HTTPException(status_code=400, detail="Status 'processing' is set by background jobs only")
+    
+    # Only the provided fields are written, in a single UPDATE ... RETURNING round-trip
+    values = update_data.model_dump(exclude_none=True)
+    if "status" in values:
+        values["status"] = _STATUS_BY_VALUE[update_data.status.value]
+        if update_data.status.value == "resolved":
+            values["resolved_at"] = datetime.utcnow()
+    if "priority" in values:
+        values["priority"] = _PRIORITY_BY_VALUE[update_data.priority.value]
+    if "category" in values:
+        values["category"] = _CATEGORY_BY_VALUE[update_data.category.value]
+    values["updated_at"] = datetime.utcnow()
     
     try:
-        # Update fields if provided
-        if update_data.title is not None:
-            ticket.title = update_data.title
-        if update_data.description is not None:
-            ticket.description = update_data.description
-        if update_data.status is not None:
-            ticket.status = TicketStatus(update_data.status.value)
-            if update_data.status.value == "resolved":
-                ticket.resolved_at = datetime.utcnow()
-        if update_data.priority is not None:
-            ticket.priority = TicketPriority(update_data.priority.value)
-        if update_data.category is not None:
-            ticket.category = TicketCategory(update_data.category.value)
-        if update_data.assigned_to is not None:
-            ticket.assigned_to = update_data.assigned_to
-        
-        ticket.updated_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(ticket)
-        
-        return TicketUpdateResponse(
-            success=True,
-            message=f"Ticket #{ticket_id} updated successfully",
-            ticket=TicketResponse.from_orm(ticket)
-        )
-        
+        row = (await db.execute(
+            update(Ticket)
+            .where(Ticket.id == ticket_id)
+            .values(**values)
+            .returning(*Ticket.__table__.columns)
+        )).first()
+        await db.commit()
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating ticket: {str(e)}")
+    
+    if row is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    return TicketUpdateResponse(
+        success=True,
+        message=f"Ticket #{ticket_id} updated successfully",
+        ticket=TicketResponse.model_validate(row._mapping)
+    )
 
 @app.delete("/tickets/{ticket_id}", response_model=TicketDeleteResponse)
-async def delete_ticket(ticket_id: int, db: Session = Depends(get_db)):
+async def delete_ticket(ticket_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a ticket
     """
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = await db.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
     
     try:
-        db.delete(ticket)
-        db.commit()
+        await db.delete(ticket)
+        await db.commit()
         
         return TicketDeleteResponse(
             success=True,
@@ -638,57 +1027,9 @@ async def delete_ticket(ticket_id: int, db: Session = Depends(get_db)):
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting ticket: {str(e)}")
 
-@app.get("/tickets/stats", response_model=TicketStatsResponse)
-async def get_ticket_stats(db: Session = Depends(get_db)):
-    """
-    Get ticket statistics
-    """
-    try:
-        total_tickets = db.query(Ticket).count()
-        open_tickets = db.query(Ticket).filter(Ticket.status == TicketStatus.OPEN).count()
-        in_progress_tickets = db.query(Ticket).filter(Ticket.status == TicketStatus.IN_PROGRESS).count()
-        resolved_tickets = db.query(Ticket).filter(Ticket.status == TicketStatus.RESOLVED).count()
-        closed_tickets = db.query(Ticket).filter(Ticket.status == TicketStatus.CLOSED).count()
-        urgent_tickets = db.query(Ticket).filter(Ticket.priority == TicketPriority.URGENT).count()
-        high_priority_tickets = db.query(Ticket).filter(Ticket.priority == TicketPriority.HIGH).count()
-        
-        # Statistics by category
-        by_category = {}
-        for category in TicketCategory:
-            count = db.query(Ticket).filter(Ticket.category == category).count()
-            by_category[category.value] = count
-        
-        # Statistics by priority
-        by_priority = {}
-        for priority in TicketPriority:
-            count = db.query(Ticket).filter(Ticket.priority == priority).count()
-            by_priority[priority.value] = count
-        
-        # Statistics by status
-        by_status = {}
-        for status in TicketStatus:
-            count = db.query(Ticket).filter(Ticket.status == status).count()
-            by_status[status.value] = count
-        
-        return TicketStatsResponse(
-            total_tickets=total_tickets,
-            open_tickets=open_tickets,
-            in_progress_tickets=in_progress_tickets,
-            resolved_tickets=resolved_tickets,
-            closed_tickets=closed_tickets,
-            urgent_tickets=urgent_tickets,
-            high_priority_tickets=high_priority_tickets,
-            by_category=by_category,
-            by_priority=by_priority,
-            by_status=by_status
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error getting ticket stats: {str(e)}")
-
 @app.post("/process/intelligent-analysis")
 async def test_intelligent_processing(
     bengali_text: str = Form(..., description="Bengali text to analyze"),
@@ -703,12 +1044,9 @@ async def test_intelligent_processing(
     try:
         # Process with intelligent processor
         intelligent_processor = get_intelligent_processor()
-        extracted_data = intelligent_processor.process_bengali_voice_input(bengali_text)
-        
-        # Import the constants for reference
-        from intelligent_ticket_processor import CATEGORIES, PRIORITIES, PRODUCTS, SUBCATEGORIES
+        extracted_data = await await_gemini(intelligent_processor.aprocess_bengali_voice_input(bengali_text))
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": "Text processed successfully with intelligent analysis",
             "input_text": bengali_text,
@@ -730,148 +1068,191 @@ async def test_intelligent_processing(
                 "available_products": list(PRODUCTS.keys()),
                 "available_subcategories": {k: v for k, v in SUBCATEGORIES.items()}
             }
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in intelligent processing: {str(e)}")
 
+@app.post("/process/complaint-stream")
+async def stream_complaint_analysis(
+    bengali_text: str = Form(..., description="Bengali complaint text to analyze"),
+):
+    """
+    Stream Gemini's analysis of a Bengali complaint as it is generated
+    
+    The body is the raw model output (a JSON object once complete); the parsed
+    result is cached, so a follow-up voice-to-ticket call for the same text is served from cache.
+    """
+    gemini = get_gemini_processor()
+    
+    async def analysis_chunks():
+        async with GEMINI_SEM:
+            async for chunk in gemini.stream_bengali_complaint(bengali_text):
+                yield chunk
+    
+    return StreamingResponse(analysis_chunks(), media_type="text/plain; charset=utf-8")
+
 @app.post("/save-audio")
 async def save_audio(audio: UploadFile = File(...)):
     """Save recorded audio file to voices folder"""
     try:
-        # Create voices directory if it doesn't exist
-        voices_dir = Path("voices")
-        voices_dir.mkdir(exist_ok=True)
-        
-        # Generate filename with timestamp
-        timestamp = int(time.time() * 1000)
+        # Generate unique filename (safe for concurrent uploads)
+        timestamp = _unique_file_id()
         filename = f"bengali_complaint_{timestamp}.wav"
-        filepath = voices_dir / filename
+        filepath = f"{VOICES_PATH}/{filename}"
         
         # Save the audio file
-        with open(filepath, "wb") as buffer:
-            content = await audio.read()
-            buffer.write(content)
+        await _stream_upload_to_disk(audio, filepath)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "filename": filename,
-            "filepath": str(filepath),
+            "filepath": filepath,
             "message": "Audio file saved successfully"
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error saving audio file: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error saving audio file: {str(e)}")
 
+async def _analyze_voice_with_attachment(bengali_text: str, attachment_content: Optional[bytes],
+                                         attachment_name: Optional[str]):
+    """Gemini voice analysis plus optional attachment analysis, returned with the ticket fields they produce"""
+    gemini = get_gemini_processor()
+    voice_analysis = await await_gemini(gemini.aprocess_bengali_complaint(bengali_text))
+    
+    # Optionally analyze attachment if provided
+    combined_analysis = None
+    
+    if attachment_content is not None:
+        # Analyze attachment with voice context
+        combined_analysis = await run_gemini(
+            gemini.analyze_attachment_with_voice,
+            attachment_content, attachment_name, bengali_text, voice_analysis
+        )
+    
+    # Build the ticket from the analysis (attachment analysis if available)
+    if combined_analysis:
+        enhanced_ticket_info = combined_analysis.get("enhanced_ticket", {})
+        # Use enhanced information from attachment analysis
+        final_title = enhanced_ticket_info.get("title", voice_analysis.get("title", "Voice Complaint with Attachment"))
+        final_description = enhanced_ticket_info.get("description", voice_analysis.get("english_translation", ""))
+        raw_category = enhanced_ticket_info.get("category", voice_analysis.get("category", "general"))
+        raw_priority = enhanced_ticket_info.get("priority", voice_analysis.get("priority", "medium"))
+    else:
+        # Use voice analysis only
+        final_title = voice_analysis.get("title", "Voice Complaint")
+        final_description = voice_analysis.get("english_translation", "")
+        raw_category = voice_analysis.get("category", "general")
+        raw_priority = voice_analysis.get("priority", "medium")
+    
+    fields = dict(
+        title=final_title,
+        description=final_description,
+        bengali_description=bengali_text,
+        attachment_analysis=combined_analysis or None,
+        # Map AI-generated categories to valid enum values
+        category=gemini._map_category_to_enum(raw_category),
+        priority=gemini._map_priority_to_enum(raw_priority)
+    )
+    return voice_analysis, combined_analysis, fields
+
 @app.post("/process/voice-with-attachment")
 async def process_voice_with_attachment(
+    background_tasks: BackgroundTasks,
     audio_file: UploadFile = File(..., description="Bengali audio file"),
     attachment_file: Optional[UploadFile] = File(None, description="Attachment file (screenshot, document, etc.) - OPTIONAL"),
     customer_name: str = Form(..., description="Customer name"),
     customer_email: Optional[str] = Form(None, description="Customer email"),
     customer_phone: Optional[str] = Form(None, description="Customer phone"),
     attachment_description: Optional[str] = Form(None, description="Description of what the attachment contains"),
-    db: Session = Depends(get_db)
+    background: bool = Form(False, description="Return 202 immediately and process in the background"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Enhanced voice processing pipeline: transcribe Bengali audio → optionally analyze attachment → combined AI analysis → create enhanced ticket
     
-    Attachment is now OPTIONAL - you can process voice complaints without attachments
+    Attachment is now OPTIONAL - you can process voice complaints without attachments.
+    With background=true the response returns 202 at once; poll /tickets/{id}/status for completion.
     """
     try:
-        # Create directories
-        voices_dir = "voices"
-        attachments_dir = "attachments"
-        for directory in [voices_dir, attachments_dir]:
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-        
-        timestamp = int(time.time())
+        timestamp = _unique_file_id()
         
-        # Step 1: Save and transcribe audio file
-        audio_extension = audio_file.filename.split(".")[-1] if "." in audio_file.filename else "wav"
+        audio_extension = _file_extension(audio_file.filename, "wav")
         audio_filename = f"complaint_audio_{timestamp}.{audio_extension}"
-        audio_path = os.path.join(voices_dir, audio_filename)
-        
-        audio_content = await audio_file.read()
-        with open(audio_path, "wb") as f:
-            f.write(audio_content)
-        
-        # Transcribe audio
-        stt = get_stt_client()
-        transcription_result = stt.transcribe_audio_file(audio_path, "bengali")
+        audio_path = f"{VOICES_PATH}/{audio_filename}"
         
-        if not transcription_result:
-            raise HTTPException(status_code=500, detail="Audio transcription failed")
-        
-        bengali_text = transcription_result.get('text', '') or transcription_result.get('transcription', '')
-        
-        if not bengali_text.strip():
-            raise HTTPException(status_code=400, detail="No speech detected in audio")
-        
-        # Step 2: Process Bengali text with Gemini
-        gemini = get_gemini_processor()
-        voice_analysis = gemini.process_bengali_complaint(bengali_text)
-        
-        # Step 3: Optionally analyze attachment if provided
         attachment_path = None
         attachment_filename = None
-        combined_analysis = None
-        
+        attachment_name = None
         if attachment_file is not None:
-            # Save attachment file
-            attachment_extension = attachment_file.filename.split(".")[-1] if "." in attachment_file.filename else "jpg"
+            attachment_name = attachment_file.filename
+            attachment_extension = _file_extension(attachment_name, "jpg")
             attachment_filename = f"attachment_{timestamp}.{attachment_extension}"
-            attachment_path = os.path.join(attachments_dir, attachment_filename)
+            attachment_path = f"{ATTACHMENTS_PATH}/{attachment_filename}"
+        
+        stt = get_stt_client()
+        
+        async def save_audio():
+            # Hash while streaming so a re-uploaded clip is answered from the transcription cache
+            hasher = new_audio_hasher()
+            await _stream_upload_to_disk(audio_file, audio_path, hasher)
+            return hasher.hexdigest()
+        
+        async def save_and_transcribe_audio():
+            return await _transcribe_bengali(stt, audio_path, await save_audio())
+        
+        async def save_attachment():
+            if attachment_file is None:
+                return None
+            # Gemini needs the attachment bytes, so it is read once and written without blocking
+            content = await attachment_file.read()
+            async with aiofiles.open(attachment_path, "wb") as f:
+                await f.write(content)
+            return content
+        
+        if background:
+            content_hash, attachment_content = await asyncio.gather(save_audio(), save_attachment())
+            ticket = await _create_processing_ticket(
+                db,
+                audio_file_path=audio_path,
+                attachment_file_path=attachment_path,
+                customer_name=customer_name,
+                customer_email=customer_email,
+                customer_phone=customer_phone
+            )
             
-            attachment_content = await attachment_file.read()
-            with open(attachment_path, "wb") as f:
-                f.write(attachment_content)
+            async def job():
+                _, bengali_text = await _transcribe_bengali(stt, audio_path, content_hash)
+                _, _, fields = await _analyze_voice_with_attachment(bengali_text, attachment_content, attachment_name)
+                return fields
             
-            # Analyze attachment with voice context
-            combined_analysis = gemini.analyze_attachment_with_voice(
-                attachment_content, attachment_file.filename, bengali_text, voice_analysis
-            )
+            background_tasks.add_task(_run_ticket_job, ticket.id, job)
+            return _accepted(ticket)
         
-        # Step 4: Create enhanced ticket with analysis (attachment analysis if available)
-        if combined_analysis:
-            enhanced_ticket_info = combined_analysis.get("enhanced_ticket", {})
-            # Use enhanced information from attachment analysis
-            final_title = enhanced_ticket_info.get("title", voice_analysis.get("title", "Voice Complaint with Attachment"))
-            final_description = enhanced_ticket_info.get("description", voice_analysis.get("english_translation", ""))
-            raw_category = enhanced_ticket_info.get("category", voice_analysis.get("category", "general"))
-            raw_priority = enhanced_ticket_info.get("priority", voice_analysis.get("priority", "medium"))
-        else:
-            # Use voice analysis only
-            final_title = voice_analysis.get("title", "Voice Complaint")
-            final_description = voice_analysis.get("english_translation", "")
-            raw_category = voice_analysis.get("category", "general")
-            raw_priority = voice_analysis.get("priority", "medium")
+        # Step 1: Save and transcribe audio while the attachment is saved
+        (transcription_result, bengali_text), attachment_content = await asyncio.gather(
+            save_and_transcribe_audio(), save_attachment()
+        )
         
-        # Map AI-generated categories to valid enum values
-        final_category = gemini._map_category_to_enum(raw_category)
-        final_priority = gemini._map_priority_to_enum(raw_priority)
-        
-        # Create the ticket
-        new_ticket = Ticket(
-            title=final_title,
-            description=final_description,
-            bengali_description=bengali_text,
+        # Step 2: Analyze the Bengali text, and the attachment if provided, with Gemini
+        voice_analysis, combined_analysis, fields = await _analyze_voice_with_attachment(
+            bengali_text, attachment_content, attachment_name
+        )
+        
+        # Step 3: Create the ticket
+        new_ticket = build_ticket(
             audio_file_path=audio_path,
             attachment_file_path=attachment_path,  # Will be None if no attachment
-            attachment_analysis=json.dumps(combined_analysis, ensure_ascii=False) if combined_analysis else None,
             customer_name=customer_name,
             customer_email=customer_email,
             customer_phone=customer_phone,
-            category=TicketCategory(final_category),
-            priority=TicketPriority(final_priority),
-            status=TicketStatus.OPEN
+            **fields
         )
         
         db.add(new_ticket)
-        db.commit()
-        db.refresh(new_ticket)
+        await db.commit()
+        await db.refresh(new_ticket)
         
         # Prepare response based on whether attachment was provided
         response_data = {
@@ -884,7 +1265,7 @@ async def process_voice_with_attachment(
                 "language_probability": transcription_result.get('language_probability', 0),
                 "audio_file": audio_path
             },
-            "ticket": TicketResponse.from_orm(new_ticket),
+            "ticket": TicketResponse.model_validate(new_ticket).model_dump(),
             "has_attachment": attachment_file is not None
         }
         
@@ -903,20 +1284,19 @@ async def process_voice_with_attachment(
                 }
             })
         
-        return response_data
+        return ORJSONResponse(response_data)
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error processing voice complaint: {str(e)}")
 
 @app.post("/rag/search")
 async def search_similar_tickets(
     query: str = Form(..., description="Search query to find similar tickets"),
-    max_results: int = Form(5, description="Maximum number of results to return"),
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+    max_results: int = Form(5, description="Maximum number of results to return")
+) -> ORJSONResponse:
     """
     RAG-based search: Find similar tickets from the knowledge base using vector similarity
     """
@@ -934,17 +1314,17 @@ async def search_similar_tickets(
         rag_service = get_rag_service()
         
         # Perform the search
-        results = rag_service.search_similar_tickets(query.strip(), max_results)
+        results = await asyncio.to_thread(rag_service.search_similar_tickets, query.strip(), max_results)
         
         logger.info(f"RAG search completed: found {len(results)} results")
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "query": query.strip(),
             "results": results,
             "total_results": len(results),
-            "database_stats": rag_service.get_database_stats()
-        }
+            "database_stats": await asyncio.to_thread(rag_service.get_database_stats)
+        })
         
     except HTTPException:
         raise
@@ -954,7 +1334,7 @@ async def search_similar_tickets(
         raise HTTPException(status_code=500, detail=f"Error in RAG search: {str(e)}")
 
 @app.post("/rag/initialize")
-async def initialize_rag_database() -> Dict[str, Any]:
+async def initialize_rag_database() -> ORJSONResponse:
     """
     Initialize the RAG database with customer support tickets from CSV
     """
@@ -963,23 +1343,23 @@ async def initialize_rag_database() -> Dict[str, Any]:
         
         # Use singleton ChromaDB RAG service
         rag_service = get_rag_service()
-        count = rag_service.initialize_database()
+        count = await asyncio.to_thread(rag_service.initialize_database)
         
         logger.info(f"RAG database initialized with {count} tickets")
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": f"RAG database initialized with {count} tickets",
             "tickets_loaded": count,
-            "database_stats": rag_service.get_database_stats()
-        }
+            "database_stats": await asyncio.to_thread(rag_service.get_database_stats)
+        })
         
     except Exception as e:
         logger.error(f"RAG initialization error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error initializing RAG database: {str(e)}")
 
 @app.get("/rag/status")
-async def get_rag_status() -> Dict[str, Any]:
+async def get_rag_status() -> ORJSONResponse:
     """
     Get RAG database status and statistics
     """
@@ -987,32 +1367,40 @@ async def get_rag_status() -> Dict[str, Any]:
         # Check if ChromaDB directory exists
         chroma_db_path = "./chroma_db"
         if not os.path.exists(chroma_db_path):
-            return {
+            return ORJSONResponse({
                 "success": False,
                 "status": "not_initialized", 
                 "message": "ChromaDB directory not found. Please initialize first.",
                 "database_path": chroma_db_path
-            }
+            })
         
         # Get database stats using singleton ChromaDB service
         rag_service = get_rag_service()
-        stats = rag_service.get_database_stats()
+        stats = await asyncio.to_thread(rag_service.get_database_stats)
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "status": "ready",
             "stats": stats,
             "database_path": chroma_db_path
-        }
+        })
         
     except Exception as e:
         logger.error(f"RAG status error: {str(e)}")
-        return {
+        return ORJSONResponse({
             "success": False,
             "status": "error",
             "error": str(e)
-        }
+        })
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    # Workers need an import string; uvloop/httptools ship with uvicorn[standard]
+    uvicorn.run(
+        "src.bangla_vai.api.main:app",
+        host=settings.FASTAPI_HOST,
+        port=settings.FASTAPI_PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.FASTAPI_WORKERS
+    )
@@ -13,17 +13,53 @@ class Settings:
     
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./data/databases/sqlite/tickets.db")
+    # Connection pool (server databases only; SQLite keeps the driver defaults)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Set when connecting through PgBouncer in transaction mode (disables prepared statement caches)
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "False").lower() == "true"
     
     # File Storage Paths
     VOICES_DIR: str = os.getenv("VOICES_DIR", "./data/uploads/voices")
     ATTACHMENTS_DIR: str = os.getenv("ATTACHMENTS_DIR", "./data/uploads/attachments")
     
+    # Cache Paths
+    STT_CACHE_DIR: str = os.getenv("STT_CACHE_DIR", "./data/cache/stt")
+    STT_CACHE_MAX_MB: int = int(os.getenv("STT_CACHE_MAX_MB", "100"))
+    TTS_CACHE_DIR: str = os.getenv("TTS_CACHE_DIR", "./data/cache/tts")
+    TTS_CACHE_MAX_MB: int = int(os.getenv("TTS_CACHE_MAX_MB", "500"))
+    GEMINI_CACHE_SIZE: int = int(os.getenv("GEMINI_CACHE_SIZE", "1024"))
+    # Remembered Gemini model choice, so startup skips list_models while it is fresh
+    GEMINI_MODEL_CACHE_FILE: str = os.getenv("GEMINI_MODEL_CACHE_FILE", "./data/cache/gemini/model.json")
+    GEMINI_MODEL_CACHE_TTL: int = int(os.getenv("GEMINI_MODEL_CACHE_TTL", "86400"))
+    # Gemini SDK transport: "grpc" (persistent HTTP/2 channel) or "rest"
+    GEMINI_TRANSPORT: str = os.getenv("GEMINI_TRANSPORT", "grpc")
+    
+    # Semantic cache: reuse the category, priority and sentiment of near-duplicate complaints (cosine similarity)
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "False").lower() == "true"
+    SEMANTIC_CACHE_MODEL: str = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2")
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_SIZE: int = int(os.getenv("SEMANTIC_CACHE_SIZE", "2048"))
+    # Entries are saved here on shutdown and reloaded on start (empty disables persistence)
+    SEMANTIC_CACHE_DIR: str = os.getenv("SEMANTIC_CACHE_DIR", "./data/cache/semantic")
+    
+    # Long Audio Chunking (requires ffmpeg/ffprobe on PATH)
+    STT_CHUNK_THRESHOLD_SEC: float = float(os.getenv("STT_CHUNK_THRESHOLD_SEC", "60"))
+    STT_CHUNK_SEC: float = float(os.getenv("STT_CHUNK_SEC", "30"))
+    STT_CHUNK_OVERLAP_SEC: float = float(os.getenv("STT_CHUNK_OVERLAP_SEC", "1"))
+    
+    # Concurrency limits for the paid speech / LLM backends (per worker)
+    STT_MAX_CONCURRENCY: int = int(os.getenv("STT_MAX_CONCURRENCY", "8"))
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "16"))
+    
     # ChromaDB Configuration
     CHROMA_DB_PATH: str = os.getenv("CHROMA_DB_PATH", "./data/databases/chroma")
     
     # API Configuration
     FASTAPI_HOST: str = os.getenv("FASTAPI_HOST", "0.0.0.0")
     FASTAPI_PORT: int = int(os.getenv("FASTAPI_PORT", "8000"))
+    FASTAPI_WORKERS: int = int(os.getenv("FASTAPI_WORKERS", str(max(2, os.cpu_count() or 1))))
     STREAMLIT_PORT: int = int(os.getenv("STREAMLIT_PORT", "8501"))
     
     # Application Settings
@@ -1,21 +1,73 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Enum
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Enum, JSON, text, insert
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.sql import func
+import asyncio
 import enum
+import logging
+import orjson
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from .config import settings
 
 # Database URL from centralized configuration
 DATABASE_URL = settings.DATABASE_URL
 
 # Create engine
+# Pool settings for server databases: pre-ping drops connections killed by a DB restart,
+# recycle stays under typical server/PgBouncer idle timeouts
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    pool_recycle=settings.DB_POOL_RECYCLE
+)
+
+# JSON columns are (de)serialized with orjson on both engines
+JSON_OPTIONS = dict(
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads
+)
+
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, **JSON_OPTIONS)
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(DATABASE_URL, **POOL_OPTIONS, **JSON_OPTIONS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to its asyncio driver (aiosqlite / asyncpg)"""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgresql+psycopg2:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+# Async engine used by the API request handlers
+ASYNC_DATABASE_URL = to_async_url(DATABASE_URL)
+def _async_connect_args(url: str) -> Dict[str, Any]:
+    """Driver options for the async engine (asyncpg only)"""
+    if not url.startswith("postgresql+asyncpg"):
+        return {}
+    connect_args: Dict[str, Any] = {"server_settings": {"application_name": "bangla-vai"}}
+    if settings.DB_PGBOUNCER:
+        # Transaction-mode PgBouncer cannot keep prepared statements across server connections
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+    return connect_args
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **JSON_OPTIONS)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, connect_args=_async_connect_args(ASYNC_DATABASE_URL), **POOL_OPTIONS, **JSON_OPTIONS
+    )
+
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
 
 class TicketStatus(enum.Enum):
@@ -23,6 +75,7 @@ class TicketStatus(enum.Enum):
     IN_PROGRESS = "in_progress"
     RESOLVED = "resolved"
     CLOSED = "closed"
+    PROCESSING = "processing"  # Voice pipeline still running in the background
 
 class TicketPriority(enum.Enum):
     LOW = "low"
@@ -46,10 +99,13 @@ class Ticket(Base):
     bengali_description = Column(Text, nullable=True)  # Original Bengali text
     audio_file_path = Column(String(500), nullable=True)  # Path to voice recording
     attachment_file_path = Column(String(500), nullable=True)  # Path to attachment file (screenshot, document, etc.)
-    attachment_analysis = Column(Text, nullable=True)  # JSON string of attachment analysis results
-    status = Column(Enum(TicketStatus), default=TicketStatus.OPEN)
-    priority = Column(Enum(TicketPriority), default=TicketPriority.MEDIUM)
-    category = Column(Enum(TicketCategory), default=TicketCategory.GENERAL)
+    # Attachment analysis results (JSONB on Postgres, JSON text elsewhere)
+    attachment_analysis = Column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True
+    )
+    status = Column(Enum(TicketStatus), default=TicketStatus.OPEN, index=True)
+    priority = Column(Enum(TicketPriority), default=TicketPriority.MEDIUM, index=True)
+    category = Column(Enum(TicketCategory), default=TicketCategory.GENERAL, index=True)
     subcategory = Column(String(100), nullable=True)  # Hard-coded subcategory for POC
     product = Column(String(100), nullable=True)  # Hard-coded product for POC
     customer_name = Column(String(100), nullable=False)
@@ -63,9 +119,57 @@ class Ticket(Base):
     def __repr__(self):
         return f"<Ticket(id={self.id}, title='{self.title}', status='{self.status.value}')>"
 
+# Postgres-only search indexes. They are optional: the app works without them, only slower
+OPTIONAL_PG_STATEMENTS = (
+    # Trigram index so customer_name ILIKE '%...%' filters can use an index
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_tickets_customer_name_trgm "
+    "ON tickets USING gin (customer_name gin_trgm_ops)",
+    # Case-insensitive prefix lookups: lower(customer_name) LIKE 'abc%'
+    "CREATE INDEX IF NOT EXISTS ix_tickets_customer_name_lower "
+    "ON tickets (lower(customer_name) text_pattern_ops)",
+)
+
+def _try_optional_ddl(description: str, create) -> None:
+    """
+    Run one optional DDL step in its own transaction, logging instead of failing startup
+    (e.g. a managed Postgres role without CREATE privilege, or another worker creating it concurrently)
+    """
+    try:
+        with engine.begin() as conn:
+            create(conn)
+    except SQLAlchemyError as e:
+        logger.warning(f"Skipped optional database step ({description}): {e}")
+
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    # create_all skips existing tables, so add indexes introduced after the table was created
+    for index in Ticket.__table__.indexes:
+        _try_optional_ddl(f"index {index.name}", lambda conn, index=index: index.create(bind=conn, checkfirst=True))
+    if engine.dialect.name == "postgresql":
+        # Native enum types created before PROCESSING existed need the new label
+        # (ALTER TYPE ... ADD VALUE cannot run inside a transaction block before Postgres 12)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ALTER TYPE ticketstatus ADD VALUE IF NOT EXISTS 'PROCESSING'"))
+        with engine.begin() as conn:
+            # attachment_analysis used to be a TEXT column holding serialized JSON
+            column_type = conn.execute(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_name = 'tickets' AND column_name = 'attachment_analysis'"
+            )).scalar()
+            if column_type == "text":
+                conn.execute(text(
+                    "ALTER TABLE tickets ALTER COLUMN attachment_analysis "
+                    "TYPE jsonb USING attachment_analysis::jsonb"
+                ))
+        for statement in OPTIONAL_PG_STATEMENTS:
+            _try_optional_ddl(statement.split(" ON ")[0], lambda conn, statement=statement: conn.execute(text(statement)))
+
+async def warm_async_pool():
+    """Open a pooled connection at startup so the first request skips the connect/TLS handshake"""
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
 
 # Dependency to get database session
 def get_db():
@@ -75,6 +179,126 @@ def get_db():
     finally:
         db.close()
 
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Insert batching: concurrent creates arriving within the window share one transaction
+INSERT_BATCH_SIZE = 32
+INSERT_BATCH_WINDOW = 0.01  # seconds
+
+logger = logging.getLogger(__name__)
+
+class TicketInsertBatcher:
+    """Coalesces concurrent ticket inserts into one multi-row INSERT ... RETURNING per batch"""
+    
+    def __init__(self, session_factory=AsyncSessionLocal, batch_size: int = INSERT_BATCH_SIZE,
+                 window: float = INSERT_BATCH_WINDOW):
+        self._session_factory = session_factory
+        self.batch_size = batch_size
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start the consumer task; a no-op when the driver cannot RETURNING from an executemany"""
+        if self.running or not async_engine.dialect.insert_returning:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Flush what is already queued, stop the consumer and fail anything submitted after"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        # The sentinel lets the consumer finish its current batch instead of being cancelled mid-flush
+        await self._queue.put(None)
+        await task
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None and not item[1].done():
+                item[1].set_exception(RuntimeError("Ticket insert batcher stopped"))
+    
+    async def submit(self, values: Dict[str, Any]):
+        """
+        Queue a ticket for insertion and wait for its batch to commit
+        
+        Args:
+            values: Column values for the new ticket
+            
+        Returns:
+            Row with every ticket column, including the generated id and timestamps
+        """
+        if self._task is None:
+            raise RuntimeError("Ticket insert batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((values, future))
+        return await future
+    
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            # Let concurrent requests join this batch, then drain what arrived
+            await asyncio.sleep(self.window)
+            stopping = False
+            while len(batch) < self.batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+    
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        # executemany needs a uniform parameter set, so group rows by the columns they supply
+        groups: Dict[Tuple[str, ...], list] = {}
+        for item in batch:
+            groups.setdefault(tuple(sorted(item[0])), []).append(item)
+        
+        results = []
+        try:
+            async with self._session_factory() as session:
+                for items in groups.values():
+                    rows = (await session.execute(
+                        insert(Ticket).returning(*Ticket.__table__.columns, sort_by_parameter_order=True),
+                        [values for values, _ in items]
+                    )).all()
+                    results.extend(zip(items, rows))
+                await session.commit()
+        except Exception as e:
+            if len(batch) > 1:
+                # Retry one by one so a single bad row does not fail its neighbours
+                logger.warning(f"Batched ticket insert failed, retrying individually: {e}")
+                for item in batch:
+                    await self._flush([item])
+                return
+            future = batch[0][1]
+            if not future.done():
+                future.set_exception(e)
+            return
+        
+        for (_, future), row in results:
+            if not future.done():
+                future.set_result(row)
+
+# Shared batcher, started and stopped by the API lifespan
+ticket_batcher = TicketInsertBatcher()
+
+# Dependency to get the ticket insert batcher
+async def get_ticket_batcher() -> TicketInsertBatcher:
+    return ticket_batcher
+
 if __name__ == "__main__":
     create_tables()
     print("Database tables created successfully!") 
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from typing import Any, Optional, List
+import orjson
 from datetime import datetime
 from enum import Enum
 
@@ -8,6 +9,7 @@ class TicketStatusEnum(str, Enum):
     IN_PROGRESS = "in_progress"
     RESOLVED = "resolved"
     CLOSED = "closed"
+    PROCESSING = "processing"  # Set only by background voice jobs
 
 class TicketPriorityEnum(str, Enum):
     LOW = "low"
@@ -66,7 +68,7 @@ class TicketResponse(BaseModel):
     bengali_description: Optional[str] = None
     audio_file_path: Optional[str] = None
     attachment_file_path: Optional[str] = None
-    attachment_analysis: Optional[str] = None
+    attachment_analysis: Optional[str] = None  # JSON-encoded analysis
     status: TicketStatusEnum
     priority: TicketPriorityEnum
     category: TicketCategoryEnum
@@ -80,8 +82,15 @@ class TicketResponse(BaseModel):
     updated_at: Optional[datetime] = None
     resolved_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+    @field_validator("attachment_analysis", mode="before")
+    @classmethod
+    def _encode_attachment_analysis(cls, value: Any) -> Any:
+        """The column stores JSON, but the API keeps returning it as a JSON string"""
+        if value is None or isinstance(value, str):
+            return value
+        return orjson.dumps(value).decode()
 
 class TicketListResponse(BaseModel):
     tickets: List[TicketResponse]
@@ -108,6 +117,12 @@ class TicketUpdateResponse(BaseModel):
     message: str
     ticket: TicketResponse
 
+class TicketJobStatusResponse(BaseModel):
+    ticket_id: int
+    status: TicketStatusEnum
+    processing: bool
+    updated_at: Optional[datetime] = None
+
 class TicketDeleteResponse(BaseModel):
     success: bool
     message: str
@@ -1,32 +1,298 @@
 import google.generativeai as genai
+import asyncio
 import os
-import json
 import re
-from typing import Dict, Any, Optional, Tuple
+import orjson
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, Protocol
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
-from dotenv import load_dotenv
 import base64
+import hashlib
 import logging
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 
 # Import from our new configuration
 from ..core.config import settings
+from .semantic_cache import SemanticCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
+# Response-parsing patterns, compiled once
+_GREEDY_JSON_RE = {
+    "{": re.compile(r'\{.*\}', re.DOTALL),
+    "[": re.compile(r'\[.*\]', re.DOTALL),
+}
+_NUMBERED_STEP_RE = re.compile(r'^\d+\.')
+
+# Valid TicketCategoryEnum / TicketPriorityEnum values
+_VALID_CATEGORIES = frozenset({"technical", "billing", "general", "complaint", "feature_request"})
+_VALID_PRIORITIES = frozenset({"low", "medium", "high", "urgent"})
+
+# Plain JSON mode for prompts that describe their own shape
+JSON_RESPONSE_CONFIG = {"response_mime_type": "application/json"}
+
+# Gemini structured-output schemas (response_mime_type="application/json")
+_COMPLAINT_PROPERTIES = {
+    "english_translation": {"type": "string"},
+    "title": {"type": "string"},
+    "category": {"type": "string", "format": "enum",
+                 "enum": ["technical", "billing", "general", "complaint", "feature_request"]},
+    "priority": {"type": "string", "format": "enum", "enum": ["low", "medium", "high", "urgent"]},
+    "key_points": {"type": "array", "items": {"type": "string"}},
+    "sentiment": {"type": "string", "format": "enum", "enum": ["positive", "negative", "neutral"]},
+    "urgency_indicators": {"type": "array", "items": {"type": "string"}},
+}
+_COMPLAINT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": _COMPLAINT_PROPERTIES,
+    "required": list(_COMPLAINT_PROPERTIES),
+}
+# Text-dependent complaint fields, requested on their own when the classification comes from the semantic cache
+_TRANSLATION_PROPERTIES = {
+    key: _COMPLAINT_PROPERTIES[key] for key in ("english_translation", "title", "key_points", "urgency_indicators")
+}
+_TRANSLATION_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": _TRANSLATION_PROPERTIES,
+    "required": list(_TRANSLATION_PROPERTIES),
+}
+# Fields a near-duplicate complaint may share; everything else is produced per request
+_SEMANTIC_FIELDS = ("category", "priority", "sentiment")
+_BATCH_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {"results": {"type": "array", "items": _COMPLAINT_RESPONSE_SCHEMA}},
+    "required": ["results"],
+}
+_FULL_TICKET_PROPERTIES = {
+    **_COMPLAINT_PROPERTIES,
+    "enhanced_description": {"type": "string"},
+    "resolution_steps": {"type": "array", "items": {"type": "string"}},
+}
+_FULL_TICKET_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": _FULL_TICKET_PROPERTIES,
+    "required": list(_FULL_TICKET_PROPERTIES),
+}
+
+# Complaint analysis instructions, sent once as the system instruction (compact schema, no per-call preamble)
+_COMPLAINT_SCHEMA = (
+    '"english_translation":str,"title":str (brief),'
+    '"category":"technical|billing|general|complaint|feature_request","priority":"low|medium|high|urgent",'
+    '"key_points":[str],"sentiment":"positive|negative|neutral","urgency_indicators":[str]'
+)
+_COMPLAINT_SYSTEM_PROMPT = (
+    "You are an expert Bengali translator and customer service analyst. "
+    "The user message is a Bengali customer complaint. Reply with only this JSON object: "
+    "{" + _COMPLAINT_SCHEMA + "}"
+)
+_FULL_TICKET_SYSTEM_PROMPT = (
+    "You are an expert Bengali translator and customer service analyst. "
+    "The user message is a Bengali customer complaint. Reply with only this JSON object: "
+    "{" + _COMPLAINT_SCHEMA + ","
+    '"enhanced_description":str (clear, professional ticket description for a support agent: '
+    'problem statement, specific details, areas to investigate),'
+    '"resolution_steps":[str] (3-5 numbered, actionable steps)}'
+)
+_TRANSLATION_SYSTEM_PROMPT = (
+    "You are an expert Bengali translator and customer service analyst. "
+    "The user message is a Bengali customer complaint. Reply with only this JSON object: "
+    '{"english_translation":str,"title":str (brief),"key_points":[str],"urgency_indicators":[str]}'
+)
+
+_BATCH_SYSTEM_PROMPT = (
+    "You are an expert Bengali translator and customer service analyst. "
+    "The user message holds Bengali customer complaints, each prefixed with its number as [[n]]. "
+    'Reply with only {"results":[...]}: one object per complaint, in the same order, each '
+    "{" + _COMPLAINT_SCHEMA + "}"
+)
+
+# Returned when Gemini cannot suggest resolution steps
+DEFAULT_RESOLUTION_STEPS = ("Review complaint details", "Contact customer for clarification", "Escalate if necessary")
+
+# Complaints per Gemini request in process_bengali_complaints_batch
+COMPLAINT_BATCH_SIZE = 16
+
+# Longer complaints are truncated before prompting
+MAX_COMPLAINT_CHARS = 4000
+
+# Responses above this size are parsed off the event loop in the async methods
+LARGE_RESPONSE_CHARS = 100_000
+
+def _extract_json_object(text: str, open_char: str = "{", close_char: str = "}") -> Optional[str]:
+    """
+    Slice the first balanced JSON object (or array) out of a model response
+    
+    Single pass over the text tracking nesting depth and string literals, so braces
+    inside strings are ignored and nothing after the object is swallowed.
+    
+    Args:
+        text (str): Raw model response
+        open_char (str): "{" for an object, "[" for an array
+        close_char (str): The matching closing character
+        
+    Returns:
+        The JSON text, or None if no balanced value was found
+    """
+    start = text.find(open_char)
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == open_char:
+            depth += 1
+        elif char == close_char:
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    
+    # Unbalanced (e.g. truncated) output: fall back to the greedy match
+    match = _GREEDY_JSON_RE[open_char].search(text, start)
+    return match.group() if match else None
+
+def _load_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a JSON object response: the whole text first (structured output),
+    then the first object scanned out of free-form text
+    
+    Returns:
+        The parsed dict, or None if the response holds no JSON object
+    """
+    try:
+        value = orjson.loads(text)
+    except orjson.JSONDecodeError:
+        json_text = _extract_json_object(text)
+        try:
+            value = orjson.loads(json_text) if json_text else None
+        except orjson.JSONDecodeError:
+            value = None
+    return value if isinstance(value, dict) else None
+
+# Keywords behind the category / priority mappings, in precedence order
+_CATEGORY_KEYWORDS = (
+    ("technical", frozenset({
+        'technical', 'tech', 'system', 'software', 'hardware', 'network',
+        'authentication', 'login', 'password', 'error', 'bug', 'crash',
+        'connection', 'database', 'server', 'api', 'integration', 'security'
+    })),
+    ("billing", frozenset({
+        'billing', 'payment', 'invoice', 'charge', 'refund', 'price',
+        'cost', 'subscription', 'plan', 'finance', 'money', 'credit'
+    })),
+    ("complaint", frozenset({
+        'complaint', 'dissatisfied', 'unhappy', 'frustrated', 'angry',
+        'service', 'support', 'quality', 'experience', 'issue', 'problem'
+    })),
+    ("feature_request", frozenset({
+        'feature', 'request', 'enhancement', 'improvement', 'suggestion',
+        'new', 'add', 'functionality', 'capability', 'wishlist'
+    })),
+)
+_PRIORITY_KEYWORDS = (
+    ("urgent", frozenset({'urgent', 'critical', 'emergency', 'immediate'})),
+    ("high", frozenset({'high', 'important', 'serious'})),
+    ("low", frozenset({'low', 'minor', 'trivial'})),
+)
+_WORD_SPLIT_RE = re.compile(r'[\W_]+')
+
+def _match_keywords(text_lower: str, table: tuple, default: str) -> str:
+    """
+    First value in the table whose keywords match: whole-word set intersection,
+    then a substring scan for inflected forms (e.g. "networking", "payments")
+    """
+    tokens = frozenset(_WORD_SPLIT_RE.split(text_lower))
+    for value, keywords in table:
+        if tokens & keywords:
+            return value
+    for value, keywords in table:
+        if any(keyword in text_lower for keyword in keywords):
+            return value
+    return default
+
+@lru_cache(maxsize=512)
+def _category_for(ai_category_lower: str) -> str:
+    """Keyword mapping behind GeminiTicketProcessor._map_category_to_enum (memoized: few distinct inputs)"""
+    return _match_keywords(ai_category_lower, _CATEGORY_KEYWORDS, "general")
+
+@lru_cache(maxsize=512)
+def _priority_for(ai_priority_lower: str) -> str:
+    """Keyword mapping behind GeminiTicketProcessor._map_priority_to_enum (memoized: few distinct inputs)"""
+    return _match_keywords(ai_priority_lower, _PRIORITY_KEYWORDS, "medium")
+
+# Attachment MIME types by extension (anything else is sent as JPEG)
+_MIME_BY_EXT = {
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".pdf": "application/pdf",
+    ".doc": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+def _mime_for(filename: str) -> str:
+    """MIME type to send an attachment to Gemini with, from its file extension"""
+    return _MIME_BY_EXT.get(os.path.splitext(filename or "")[1].lower(), "image/jpeg")
+
+class CacheBackend(Protocol):
+    """Storage for JSON-serialized Gemini results (in-process by default; Redis fits the same shape)"""
+    
+    def get(self, key: str) -> Optional[str]: ...
+    
+    def set(self, key: str, value: str) -> None: ...
+
+class InMemoryCacheBackend:
+    """Thread-safe LRU cache backend"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
 class GeminiTicketProcessor:
-    def __init__(self):
+    def __init__(self, cache_backend: Optional[CacheBackend] = None):
         """Initialize Gemini AI client for Bengali text processing"""
         self.api_key = settings.GOOGLE_API_KEY
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
         
-        # Configure Gemini
-        genai.configure(api_key=self.api_key)
+        # Configure Gemini. The SDK keeps one client (a long-lived, multiplexed HTTP/2 channel with the
+        # default "grpc" transport) per process, shared by every thread using this processor
+        genai.configure(api_key=self.api_key, transport=settings.GEMINI_TRANSPORT)
         
         # Initialize the model (using latest Gemini 2.5 models)
         # Try multiple model names for compatibility - prioritize 2.5 over 1.5
@@ -41,26 +307,119 @@ class GeminiTicketProcessor:
         self.model = None
         self.model_name = None
         
-        for model_name in self.model_names:
-            try:
-                self.model = genai.GenerativeModel(model_name)
-                self.model_name = model_name
-                print(f"✅ Successfully initialized Gemini model: {model_name}")
-                break
-            except Exception as e:
-                print(f"❌ Failed to initialize model {model_name}: {str(e)}")
-                continue
+        # One list_models call (or the choice remembered from a recent start) instead of probing each candidate
+        chosen_model = self._select_model_name()
+        if chosen_model:
+            self.model = genai.GenerativeModel(chosen_model)
+            self.model_name = chosen_model
+            logger.info(f"Initialized Gemini model: {chosen_model}")
+        else:
+            # Nothing could be confirmed (e.g. offline): fall back to the first constructible candidate
+            for model_name in self.model_names:
+                try:
+                    self.model = genai.GenerativeModel(model_name)
+                    self.model_name = model_name
+                    logger.info(f"Initialized Gemini model: {model_name}")
+                    break
+                except Exception as e:
+                    logger.debug(f"Failed to initialize model {model_name}: {e}")
+                    continue
         
         if not self.model:
             raise ValueError("❌ No valid Gemini model could be initialized. Check your API key and quota.")
         
-        # Initialize LangChain model
-        self.llm = ChatGoogleGenerativeAI(
+        # Exact-match result cache, keyed by model + normalized input
+        self._cache: CacheBackend = cache_backend or InMemoryCacheBackend(settings.GEMINI_CACHE_SIZE)
+        # Near-duplicate tier behind the exact cache: shares only the classification (complaint analysis only)
+        self.semantic_cache = SemanticCache(
+            settings.SEMANTIC_CACHE_MODEL,
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            maxsize=settings.SEMANTIC_CACHE_SIZE,
+            path=settings.SEMANTIC_CACHE_DIR or None
+        ) if settings.SEMANTIC_CACHE_ENABLED else None
+    
+    @cached_property
+    def llm(self) -> ChatGoogleGenerativeAI:
+        """LangChain chat model for LangChain-based callers, built on first use"""
+        return ChatGoogleGenerativeAI(
             model=self.model_name,
             google_api_key=self.api_key,
             temperature=0.3
         )
     
+    @cached_property
+    def complaint_model(self) -> genai.GenerativeModel:
+        """Gemini model with the complaint analysis instructions and JSON response schema"""
+        return genai.GenerativeModel(
+            self.model_name,
+            system_instruction=_COMPLAINT_SYSTEM_PROMPT,
+            generation_config={"response_mime_type": "application/json", "response_schema": _COMPLAINT_RESPONSE_SCHEMA}
+        )
+    
+    @cached_property
+    def translation_model(self) -> genai.GenerativeModel:
+        """Gemini model for the text-dependent complaint fields of a semantic cache hit"""
+        return genai.GenerativeModel(
+            self.model_name,
+            system_instruction=_TRANSLATION_SYSTEM_PROMPT,
+            generation_config={"response_mime_type": "application/json", "response_schema": _TRANSLATION_RESPONSE_SCHEMA}
+        )
+    
+    def warm_semantic_cache(self) -> None:
+        """Load the semantic cache encoder up front so no request pays for it"""
+        if self.semantic_cache is None:
+            return
+        try:
+            self.semantic_cache.encoder.encode(["warmup"])
+        except ImportError as e:
+            logger.warning(f"Semantic cache disabled: {e}")
+            self.semantic_cache = None
+    
+    @cached_property
+    def batch_model(self) -> genai.GenerativeModel:
+        """Gemini model with the batch instructions and {"results": [...]} response schema"""
+        return genai.GenerativeModel(
+            self.model_name,
+            system_instruction=_BATCH_SYSTEM_PROMPT,
+            generation_config={"response_mime_type": "application/json", "response_schema": _BATCH_RESPONSE_SCHEMA}
+        )
+    
+    @cached_property
+    def full_ticket_model(self) -> genai.GenerativeModel:
+        """Gemini model with the fused ticket instructions and JSON response schema"""
+        return genai.GenerativeModel(
+            self.model_name,
+            system_instruction=_FULL_TICKET_SYSTEM_PROMPT,
+            generation_config={"response_mime_type": "application/json", "response_schema": _FULL_TICKET_RESPONSE_SCHEMA}
+        )
+    
+    @staticmethod
+    def _prepare_complaint_text(bengali_text: str) -> str:
+        """Strip and NFC-normalize complaint text, truncating it to MAX_COMPLAINT_CHARS"""
+        text = unicodedata.normalize("NFC", (bengali_text or "").strip())
+        if len(text) > MAX_COMPLAINT_CHARS:
+            logger.warning(f"Complaint text truncated from {len(text)} to {MAX_COMPLAINT_CHARS} characters")
+            text = text[:MAX_COMPLAINT_CHARS] + "..."
+        return text
+    
+    def _cache_key(self, kind: str, *parts: str) -> str:
+        """SHA-256 of the model, the call kind and the NFC/whitespace-normalized inputs"""
+        payload = {
+            "model": self.model_name,
+            "kind": kind,
+            "inputs": [unicodedata.normalize("NFC", " ".join(part.split())) for part in parts]
+        }
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _cache_get(self, key: str) -> Any:
+        """Return a fresh copy of a cached result, or None"""
+        raw = self._cache.get(key)
+        return orjson.loads(raw) if raw is not None else None
+    
+    def _cache_put(self, key: str, value: Any) -> None:
+        """Store a result in the cache backend"""
+        self._cache.set(key, orjson.dumps(value).decode())
+    
     def process_bengali_complaint(self, bengali_text: str) -> Dict[str, Any]:
         """
         Process Bengali complaint text and extract structured information
@@ -71,65 +430,294 @@ class GeminiTicketProcessor:
         Returns:
             Dict containing structured ticket information
         """
+        bengali_text = self._prepare_complaint_text(bengali_text)
+        if not bengali_text:
+            return self._parse_fallback_response("", bengali_text)
+        
+        cache_key, cached, embedding, similar = self._complaint_cache_lookup(bengali_text)
+        if cached is not None:
+            return cached
+        
         try:
-            # First, translate and understand the Bengali text
-            translation_prompt = f"""
-            You are an expert Bengali language translator and customer service analyst.
-            
-            Please analyze the following Bengali complaint/issue description and provide:
-            1. English translation
-            2. Issue category (technical, billing, general, complaint, feature_request)
-            3. Priority level (low, medium, high, urgent)
-            4. Brief title/summary
-            5. Key details extracted
-            
-            Bengali Text: {bengali_text}
+            if similar is not None:
+                response = self.translation_model.generate_content(bengali_text)
+                return self._similar_complaint_result(response.text, bengali_text, similar)
+            response = self.complaint_model.generate_content(bengali_text)
+            return self._complaint_result(response.text, bengali_text, cache_key, embedding)
+        except Exception:
+            logger.exception("Error processing Bengali text with Gemini")
+            return self._complaint_error_result(bengali_text)
+    
+    async def aprocess_bengali_complaint(self, bengali_text: str) -> Dict[str, Any]:
+        """Async peer of process_bengali_complaint (sentence embedding in a worker thread, native async Gemini call)"""
+        bengali_text = self._prepare_complaint_text(bengali_text)
+        if not bengali_text:
+            return self._parse_fallback_response("", bengali_text)
+        
+        cache_key, cached, embedding, similar = await asyncio.to_thread(self._complaint_cache_lookup, bengali_text)
+        if cached is not None:
+            return cached
+        
+        try:
+            if similar is not None:
+                response = await self.translation_model.generate_content_async(bengali_text)
+                return self._similar_complaint_result(response.text, bengali_text, similar)
+            response = await self.complaint_model.generate_content_async(bengali_text)
+            if len(response.text) > LARGE_RESPONSE_CHARS:
+                return await asyncio.to_thread(
+                    self._complaint_result, response.text, bengali_text, cache_key, embedding
+                )
+            return self._complaint_result(response.text, bengali_text, cache_key, embedding)
+        except Exception:
+            logger.exception("Error processing Bengali text with Gemini")
+            return self._complaint_error_result(bengali_text)
+    
+    async def stream_bengali_complaint(self, bengali_text: str) -> AsyncIterator[str]:
+        """
+        Stream the Gemini analysis of a Bengali complaint as it is generated
+        
+        Args:
+            bengali_text (str): Bengali complaint text
             
-            Please respond in the following JSON format:
-            {{
-                "english_translation": "Complete English translation",
-                "title": "Brief descriptive title",
-                "category": "one of: technical, billing, general, complaint, feature_request",
-                "priority": "one of: low, medium, high, urgent",
-                "key_points": ["list", "of", "key", "issues"],
-                "sentiment": "positive/negative/neutral",
-                "urgency_indicators": ["any", "urgent", "words", "found"]
-            }}
-            """
+        Yields:
+            Raw response text chunks (the whole cached JSON when the result is already known)
+        """
+        bengali_text = self._prepare_complaint_text(bengali_text)
+        if not bengali_text:
+            yield orjson.dumps(self._parse_fallback_response("", bengali_text)).decode()
+            return
+        
+        # The full analysis is streamed, so a semantic hit's classification is not used here
+        cache_key, cached, embedding, _ = await asyncio.to_thread(self._complaint_cache_lookup, bengali_text)
+        if cached is not None:
+            yield orjson.dumps(cached).decode()
+            return
+        
+        buffer = []
+        depth = 0
+        opened = parsed = False
+        async for chunk in await self.complaint_model.generate_content_async(bengali_text, stream=True):
+            text = chunk.text
+            if not text:
+                continue
+            buffer.append(text)
+            yield text
             
-            response = self.model.generate_content(translation_prompt)
+            # Parse once, as soon as the braces balance, instead of re-scanning the buffer per chunk
+            if not parsed:
+                depth += text.count('{') - text.count('}')
+                opened = opened or '{' in text
+                if opened and depth <= 0:
+                    self._complaint_result("".join(buffer), bengali_text, cache_key, embedding)
+                    parsed = True
+        
+        if not parsed and buffer:
+            self._complaint_result("".join(buffer), bengali_text, cache_key, embedding)
+    
+    def process_bengali_complaints_batch(self, bengali_texts: List[str],
+                                         batch_size: int = COMPLAINT_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Process several Bengali complaints with one Gemini request per batch
+        
+        Args:
+            bengali_texts (list): Bengali complaint texts
+            batch_size (int): Complaints per request; larger lists are split into chunks
             
-            # Parse the response
+        Returns:
+            List of structured ticket information, in input order
+        """
+        bengali_texts = [self._prepare_complaint_text(text) for text in bengali_texts]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(bengali_texts)
+        pending = []
+        for i, bengali_text in enumerate(bengali_texts):
+            if not bengali_text:
+                results[i] = self._parse_fallback_response("", bengali_text)
+                continue
+            # Semantic hits are analyzed in full with the batch, which costs no extra request
+            cache_key, cached, embedding, _ = self._complaint_cache_lookup(bengali_text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append((i, cache_key, embedding))
+        
+        for start in range(0, len(pending), max(1, batch_size)):
+            chunk = pending[start:start + max(1, batch_size)]
+            if len(chunk) < 2:
+                continue
             try:
-                # Extract JSON from response
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    # Fallback parsing
-                    result = self._parse_fallback_response(response.text, bengali_text)
-                
-                # Validate and clean the result
-                result = self._validate_and_clean_result(result)
-                
-                return result
+                numbered = "\n".join(f"[[{n}]] {bengali_texts[i]}" for n, (i, _, _) in enumerate(chunk, 1))
+                response = self.batch_model.generate_content(numbered)
+                parsed = _load_json_object(response.text) or {}
+                items = parsed.get("results")
+                if not isinstance(items, list) or len(items) != len(chunk):
+                    # Misaligned response: the items cannot be matched to their complaints
+                    logger.warning(f"Batch returned {len(items) if isinstance(items, list) else 'no'} results "
+                                   f"for {len(chunk)} complaints; processing them one by one")
+                    continue
                 
-            except json.JSONDecodeError:
-                # Fallback parsing if JSON fails
-                return self._parse_fallback_response(response.text, bengali_text)
-                
-        except Exception as e:
-            print(f"Error processing Bengali text with Gemini: {str(e)}")
-            # Return a basic fallback result
-            return {
-                "english_translation": f"Error translating: {bengali_text}",
-                "title": "Voice Complaint",
-                "category": "general",
-                "priority": "medium",
-                "key_points": ["Processing error occurred"],
-                "sentiment": "neutral",
-                "urgency_indicators": []
-            }
+                for (i, cache_key, embedding), item in zip(chunk, items):
+                    if not isinstance(item, dict):
+                        continue
+                    result = self._validate_and_clean_result(item)
+                    self._cache_put(cache_key, result)
+                    if embedding is not None:
+                        self._semantic_add(embedding, result)
+                    results[i] = result
+            except Exception:
+                logger.exception("Error processing Bengali complaint batch with Gemini")
+        
+        # Single items, failed batches and malformed entries go through the single-complaint path
+        for i, _, _ in pending:
+            if results[i] is None:
+                results[i] = self.process_bengali_complaint(bengali_texts[i])
+        return results
+    
+    def _complaint_cache_lookup(
+        self, bengali_text: str
+    ) -> Tuple[str, Optional[Dict[str, Any]], Any, Optional[Dict[str, Any]]]:
+        """
+        Check the exact and semantic caches
+        
+        Returns:
+            (cache_key, cached_result, embedding, similar): similar holds the _SEMANTIC_FIELDS
+            of a near-duplicate complaint, and embedding is set when a new result should be added
+        """
+        cache_key = self._cache_key("complaint", bengali_text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cache_key, cached, None, None
+        
+        embedding = None
+        if self.semantic_cache is not None:
+            try:
+                embedding = self.semantic_cache.embed(bengali_text)
+                similar = self.semantic_cache.lookup(embedding)
+                if similar is not None:
+                    # Filtered on read too: entries persisted by older versions hold whole analyses
+                    similar = orjson.loads(similar)
+                    return cache_key, None, None, {key: similar[key] for key in _SEMANTIC_FIELDS if key in similar}
+            except ImportError as e:
+                # sentence-transformers is not installed: drop the tier instead of retrying per request
+                logger.warning(f"Semantic cache disabled: {e}")
+                self.semantic_cache = None
+            except Exception as e:
+                logger.warning(f"Semantic cache unavailable: {e}")
+        return cache_key, None, embedding, None
+    
+    def _semantic_add(self, embedding: Any, result: Dict[str, Any]) -> None:
+        """Store the text-independent fields of a result in the semantic cache"""
+        self.semantic_cache.add(embedding, orjson.dumps({key: result[key] for key in _SEMANTIC_FIELDS}).decode())
+    
+    def _similar_complaint_result(self, response_text: str, bengali_text: str,
+                                  similar: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine a translation response with a near-duplicate's classification (not cached)"""
+        parsed = _load_json_object(response_text)
+        if parsed is None:
+            return self._parse_fallback_response(response_text, bengali_text)
+        return self._validate_and_clean_result({**parsed, **similar})
+    
+    def _complaint_result(self, response_text: str, bengali_text: str, cache_key: str, embedding: Any) -> Dict[str, Any]:
+        """Parse a complaint analysis response, caching it when it was valid JSON"""
+        parsed = _load_json_object(response_text)
+        if parsed is None:
+            # Fallback parsing (not cached)
+            return self._parse_fallback_response(response_text, bengali_text)
+        
+        # Validate and clean the result
+        result = self._validate_and_clean_result(parsed)
+        self._cache_put(cache_key, result)
+        if embedding is not None:
+            self._semantic_add(embedding, result)
+        return result
+    
+    @staticmethod
+    def _complaint_error_result(bengali_text: str) -> Dict[str, Any]:
+        """Basic result returned when Gemini could not be reached"""
+        return {
+            "english_translation": f"Error translating: {bengali_text}",
+            "title": "Voice Complaint",
+            "category": "general",
+            "priority": "medium",
+            "key_points": ["Processing error occurred"],
+            "sentiment": "neutral",
+            "urgency_indicators": []
+        }
+    
+    def process_full_ticket(self, bengali_text: str) -> Dict[str, Any]:
+        """
+        Analyze a Bengali complaint, write the ticket description and suggest resolution steps in one Gemini call
+        
+        Args:
+            bengali_text (str): Bengali complaint text
+            
+        Returns:
+            The process_bengali_complaint fields plus "enhanced_description" and "resolution_steps"
+        """
+        bengali_text = self._prepare_complaint_text(bengali_text)
+        if not bengali_text:
+            return self._full_ticket_fallback(self._parse_fallback_response("", bengali_text))
+        
+        cache_key = self._cache_key("full", bengali_text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = self.full_ticket_model.generate_content(bengali_text)
+            return self._full_ticket_result(response.text, bengali_text, cache_key)
+        except Exception:
+            logger.exception("Error processing full ticket with Gemini")
+            return self._full_ticket_fallback(self._complaint_error_result(bengali_text))
+    
+    async def aprocess_full_ticket(self, bengali_text: str) -> Dict[str, Any]:
+        """Async peer of process_full_ticket"""
+        bengali_text = self._prepare_complaint_text(bengali_text)
+        if not bengali_text:
+            return self._full_ticket_fallback(self._parse_fallback_response("", bengali_text))
+        
+        cache_key = self._cache_key("full", bengali_text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.full_ticket_model.generate_content_async(bengali_text)
+            return self._full_ticket_result(response.text, bengali_text, cache_key)
+        except Exception:
+            logger.exception("Error processing full ticket with Gemini")
+            return self._full_ticket_fallback(self._complaint_error_result(bengali_text))
+    
+    def _full_ticket_result(self, response_text: str, bengali_text: str, cache_key: str) -> Dict[str, Any]:
+        """
+        Parse a fused response and seed the per-stage caches from it, so later
+        process_bengali_complaint / enhance_ticket_description / suggest_resolution_steps
+        calls for the same ticket are served without another round trip
+        """
+        parsed = _load_json_object(response_text)
+        if parsed is None:
+            return self._full_ticket_fallback(self._parse_fallback_response(response_text, bengali_text))
+        
+        analysis = self._validate_and_clean_result(parsed)
+        description = str(parsed.get("enhanced_description") or analysis["english_translation"])
+        steps = parsed.get("resolution_steps")
+        steps = [str(step) for step in steps][:5] if isinstance(steps, list) and steps else list(DEFAULT_RESOLUTION_STEPS)
+        
+        self._cache_put(self._cache_key("complaint", bengali_text), analysis)
+        self._cache_put(self._enhance_cache_key(analysis["english_translation"], analysis["key_points"]), description)
+        self._cache_put(self._resolution_cache_key(analysis), steps)
+        
+        result = {**analysis, "enhanced_description": description, "resolution_steps": steps}
+        self._cache_put(cache_key, result)
+        return result
+    
+    @staticmethod
+    def _full_ticket_fallback(analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Fused result built from a fallback analysis (not cached)"""
+        return {
+            **analysis,
+            "enhanced_description": analysis["english_translation"],
+            "resolution_steps": list(DEFAULT_RESOLUTION_STEPS)
+        }
     
     def _parse_fallback_response(self, response_text: str, original_bengali: str) -> Dict[str, Any]:
         """Fallback parsing when JSON parsing fails"""
@@ -145,28 +733,21 @@ class GeminiTicketProcessor:
     
     def _validate_and_clean_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean the AI response"""
-        # Valid categories and priorities
-        valid_categories = {"technical", "billing", "general", "complaint", "feature_request"}
-        valid_priorities = {"low", "medium", "high", "urgent"}
+        # Exact enum values (the usual case) skip the keyword mapping
+        category = str(result.get("category") or "general").strip().lower()
+        priority = str(result.get("priority") or "medium").strip().lower()
         
         # Ensure all required fields exist with defaults
         cleaned_result = {
             "english_translation": result.get("english_translation", "Translation not available"),
-            "title": result.get("title", "Voice Complaint")[:200],  # Limit title length
-            "category": self._map_category_to_enum(result.get("category", "general")),
-            "priority": self._map_priority_to_enum(result.get("priority", "medium")),
+            "title": str(result.get("title", "Voice Complaint"))[:200],  # Limit title length
+            "category": category if category in _VALID_CATEGORIES else self._map_category_to_enum(category),
+            "priority": priority if priority in _VALID_PRIORITIES else self._map_priority_to_enum(priority),
             "key_points": result.get("key_points", []),
             "sentiment": result.get("sentiment", "neutral"),
             "urgency_indicators": result.get("urgency_indicators", [])
         }
         
-        # Additional validation (redundant but safe)
-        if cleaned_result["category"] not in valid_categories:
-            cleaned_result["category"] = "general"
-        
-        if cleaned_result["priority"] not in valid_priorities:
-            cleaned_result["priority"] = "medium"
-        
         # Ensure key_points is a list
         if not isinstance(cleaned_result["key_points"], list):
             cleaned_result["key_points"] = [str(cleaned_result["key_points"])]
@@ -175,8 +756,47 @@ class GeminiTicketProcessor:
     
     def enhance_ticket_description(self, english_translation: str, key_points: list) -> str:
         """Create an enhanced description for the ticket"""
+        cache_key = self._enhance_cache_key(english_translation, key_points)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            enhancement_prompt = f"""
+            response = self.model.generate_content(self._enhancement_prompt(english_translation, key_points))
+            self._cache_put(cache_key, response.text)
+            return response.text
+            
+        except Exception:
+            logger.exception("Error enhancing description")
+            # Return the basic translation as fallback
+            return english_translation
+    
+    async def aenhance_ticket_description(self, english_translation: str, key_points: list) -> str:
+        """Async peer of enhance_ticket_description"""
+        cache_key = self._enhance_cache_key(english_translation, key_points)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.model.generate_content_async(
+                self._enhancement_prompt(english_translation, key_points)
+            )
+            self._cache_put(cache_key, response.text)
+            return response.text
+            
+        except Exception:
+            logger.exception("Error enhancing description")
+            return english_translation
+    
+    def _enhance_cache_key(self, english_translation: str, key_points: list) -> str:
+        """Cache key over the translation and the (order-insensitive) key points"""
+        return self._cache_key("enhance", english_translation, *sorted(map(str, key_points)))
+    
+    @staticmethod
+    def _enhancement_prompt(english_translation: str, key_points: list) -> str:
+        """Prompt for a support-ready ticket description"""
+        return f"""
             Based on the following customer complaint translation and key points, create a clear, 
             professional ticket description that a customer service representative can easily understand and act upon.
             
@@ -190,19 +810,59 @@ class GeminiTicketProcessor:
             
             Keep it concise but comprehensive.
             """
-            
-            response = self.model.generate_content(enhancement_prompt)
-            return response.text
-            
-        except Exception as e:
-            print(f"Error enhancing description: {str(e)}")
-            # Return the basic translation as fallback
-            return english_translation
     
     def suggest_resolution_steps(self, ticket_info: Dict[str, Any]) -> list:
         """Suggest potential resolution steps based on ticket information"""
+        cache_key = self._resolution_cache_key(ticket_info)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            resolution_prompt = f"""
+            response = self.model.generate_content(self._resolution_prompt(ticket_info))
+            steps = self._extract_resolution_steps(response.text)
+            self._cache_put(cache_key, steps)
+            return steps
+            
+        except Exception:
+            logger.exception("Error generating resolution steps")
+            return list(DEFAULT_RESOLUTION_STEPS)
+    
+    async def asuggest_resolution_steps(self, ticket_info: Dict[str, Any]) -> list:
+        """Async peer of suggest_resolution_steps"""
+        cache_key = self._resolution_cache_key(ticket_info)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.model.generate_content_async(self._resolution_prompt(ticket_info))
+            steps = self._extract_resolution_steps(response.text)
+            self._cache_put(cache_key, steps)
+            return steps
+            
+        except Exception:
+            logger.exception("Error generating resolution steps")
+            return list(DEFAULT_RESOLUTION_STEPS)
+    
+    def _resolution_cache_key(self, ticket_info: Dict[str, Any]) -> str:
+        """
+        Cache key over category, priority and the (order- and case-insensitive) key points
+        
+        The translation is left out on purpose: recurring complaints of the same kind
+        share their resolution steps instead of paying for another Gemini call.
+        """
+        return self._cache_key(
+            "resolution",
+            str(ticket_info.get('category')),
+            str(ticket_info.get('priority')),
+            *sorted(str(point).lower() for point in ticket_info.get('key_points', []))
+        )
+    
+    @staticmethod
+    def _resolution_prompt(ticket_info: Dict[str, Any]) -> str:
+        """Prompt for 3-5 numbered resolution steps"""
+        return f"""
             Based on this customer complaint, suggest 3-5 specific resolution steps for customer service:
             
             Category: {ticket_info.get('category')}
@@ -212,23 +872,17 @@ class GeminiTicketProcessor:
             
             Provide a numbered list of actionable steps.
             """
-            
-            response = self.model.generate_content(resolution_prompt)
-            
-            # Extract numbered steps from response
-            steps = []
-            lines = response.text.split('\n')
-            for line in lines:
-                line = line.strip()
-                if re.match(r'^\d+\.', line):
-                    steps.append(line)
-            
-            return steps[:5]  # Limit to 5 steps
-            
-        except Exception as e:
-            print(f"Error generating resolution steps: {str(e)}")
-            return ["Review complaint details", "Contact customer for clarification", "Escalate if necessary"]
     
+    @staticmethod
+    def _extract_resolution_steps(response_text: str) -> list:
+        """Numbered steps from the response, at most 5"""
+        steps = []
+        for line in response_text.split('\n'):
+            line = line.strip()
+            if line[:1].isdigit() and _NUMBERED_STEP_RE.match(line):
+                steps.append(line)
+        return steps[:5]
+
     def list_available_models(self):
         """List all available Gemini models for debugging"""
         try:
@@ -238,10 +892,72 @@ class GeminiTicketProcessor:
                 if 'generateContent' in model.supported_generation_methods:
                     available_models.append(model.name)
             return available_models
-        except Exception as e:
-            print(f"Error listing models: {str(e)}")
+        except Exception:
+            logger.exception("Error listing models")
             return []
 
+    def _select_model_name(self) -> Optional[str]:
+        """
+        First preferred model that supports generateContent for this API key
+        
+        Uses one list_models call, or concurrent probes of the candidates if listing fails.
+        The choice is remembered in GEMINI_MODEL_CACHE_FILE for GEMINI_MODEL_CACHE_TTL seconds,
+        so worker restarts skip both.
+        
+        Returns:
+            Model name, or None if no candidate could be confirmed
+        """
+        cache_file = settings.GEMINI_MODEL_CACHE_FILE
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = orjson.loads(f.read())
+            if (cached["model"] in self.model_names
+                    and time.time() - cached["checked_at"] < settings.GEMINI_MODEL_CACHE_TTL):
+                return cached["model"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        available = set(self.list_available_models())
+        chosen_model = next((name for name in self.model_names if name in available), None)
+        if not chosen_model:
+            chosen_model = self._probe_model_names()
+        if chosen_model:
+            self._remember_model_name(chosen_model)
+        return chosen_model
+    
+    def _probe_model_names(self) -> Optional[str]:
+        """Probe every candidate concurrently (count_tokens); the most preferred one that answers wins"""
+        def probe(model_name: str) -> str:
+            genai.GenerativeModel(model_name).count_tokens("x")
+            return model_name
+        
+        executor = ThreadPoolExecutor(max_workers=len(self.model_names), thread_name_prefix="gemini-probe")
+        try:
+            futures = [executor.submit(probe, model_name) for model_name in self.model_names]
+            for model_name, future in zip(self.model_names, futures):
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.debug(f"Failed to probe model {model_name}: {e}")
+            return None
+        finally:
+            # Don't wait for slower, less preferred probes once a winner is known
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _remember_model_name(model_name: str) -> None:
+        """Persist the chosen model to GEMINI_MODEL_CACHE_FILE"""
+        cache_file = settings.GEMINI_MODEL_CACHE_FILE
+        try:
+            cache_dir = os.path.dirname(cache_file) or "."
+            os.makedirs(cache_dir, exist_ok=True)
+            # Concurrent workers each write a whole file and rename it into place
+            with tempfile.NamedTemporaryFile('wb', dir=cache_dir, suffix='.tmp', delete=False) as f:
+                f.write(orjson.dumps({"model": model_name, "checked_at": time.time()}))
+            os.replace(f.name, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not persist Gemini model choice: {e}")
+    
     def analyze_attachment_with_voice(self, attachment_bytes: bytes, attachment_filename: str, voice_text: str, voice_analysis: Dict[str, Any]) -> Dict[str, Any]:
         """
         Analyze an attachment (image/screenshot) in context of the voice complaint
@@ -328,20 +1044,8 @@ class GeminiTicketProcessor:
             
             # Use Gemini Vision to analyze the attachment with voice context
             # Create the image part from raw bytes
-            import google.generativeai as genai
-            
             # Determine mime type from filename
-            mime_type = "image/jpeg"  # Default
-            if attachment_filename.lower().endswith(('.png',)):
-                mime_type = "image/png"
-            elif attachment_filename.lower().endswith(('.gif',)):
-                mime_type = "image/gif"
-            elif attachment_filename.lower().endswith(('.webp',)):
-                mime_type = "image/webp"
-            elif attachment_filename.lower().endswith(('.pdf',)):
-                mime_type = "application/pdf"
-            elif attachment_filename.lower().endswith(('.doc', '.docx')):
-                mime_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            mime_type = _mime_for(attachment_filename)
             
             # Create the attachment part for Gemini
             attachment_part = {
@@ -350,34 +1054,25 @@ class GeminiTicketProcessor:
             }
             
             # Send prompt and attachment to Gemini
-            response = self.model.generate_content([combined_prompt, attachment_part])
+            response = self.model.generate_content([combined_prompt, attachment_part], generation_config=JSON_RESPONSE_CONFIG)
             
             # Parse the response
-            try:
-                # Extract JSON from response
-                import re
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    # Map categories and priorities in enhanced_ticket to valid enum values
-                    if 'enhanced_ticket' in result and isinstance(result['enhanced_ticket'], dict):
-                        enhanced_ticket = result['enhanced_ticket']
-                        if 'category' in enhanced_ticket:
-                            enhanced_ticket['category'] = self._map_category_to_enum(enhanced_ticket['category'])
-                        if 'priority' in enhanced_ticket:
-                            enhanced_ticket['priority'] = self._map_priority_to_enum(enhanced_ticket['priority'])
-                else:
-                    # Fallback parsing
-                    result = self._parse_fallback_attachment_response(response.text, voice_text, voice_analysis)
-                
-                return result
-                
-            except json.JSONDecodeError:
-                # Fallback parsing if JSON fails
+            result = _load_json_object(response.text)
+            if result is None:
+                # Fallback parsing
                 return self._parse_fallback_attachment_response(response.text, voice_text, voice_analysis)
+            
+            # Map categories and priorities in enhanced_ticket to valid enum values
+            if 'enhanced_ticket' in result and isinstance(result['enhanced_ticket'], dict):
+                enhanced_ticket = result['enhanced_ticket']
+                if 'category' in enhanced_ticket:
+                    enhanced_ticket['category'] = self._map_category_to_enum(enhanced_ticket['category'])
+                if 'priority' in enhanced_ticket:
+                    enhanced_ticket['priority'] = self._map_priority_to_enum(enhanced_ticket['priority'])
+            return result
                 
-        except Exception as e:
-            print(f"Error analyzing attachment with voice: {str(e)}")
+        except Exception:
+            logger.exception("Error analyzing attachment with voice")
             # Return a basic fallback result
             return {
                 "attachment_analysis": {
@@ -449,17 +1144,7 @@ class GeminiTicketProcessor:
             """
             
             # Determine mime type from filename
-            mime_type = "image/jpeg"  # Default
-            if attachment_filename.lower().endswith(('.png',)):
-                mime_type = "image/png"
-            elif attachment_filename.lower().endswith(('.gif',)):
-                mime_type = "image/gif"
-            elif attachment_filename.lower().endswith(('.webp',)):
-                mime_type = "image/webp"
-            elif attachment_filename.lower().endswith(('.pdf',)):
-                mime_type = "application/pdf"
-            elif attachment_filename.lower().endswith(('.doc', '.docx')):
-                mime_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            mime_type = _mime_for(attachment_filename)
             
             # Create the attachment part for Gemini
             attachment_part = {
@@ -467,29 +1152,22 @@ class GeminiTicketProcessor:
                 "data": attachment_bytes
             }
             
-            response = self.model.generate_content([attachment_prompt, attachment_part])
+            response = self.model.generate_content([attachment_prompt, attachment_part], generation_config=JSON_RESPONSE_CONFIG)
             
             # Parse the response
-            try:
-                import re
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    # Map categories and priorities to valid enum values
-                    if 'suggested_category' in result:
-                        result['suggested_category'] = self._map_category_to_enum(result['suggested_category'])
-                    if 'suggested_priority' in result:
-                        result['suggested_priority'] = self._map_priority_to_enum(result['suggested_priority'])
-                else:
-                    result = self._parse_basic_attachment_fallback(response.text)
-                
-                return result
-                
-            except json.JSONDecodeError:
+            result = _load_json_object(response.text)
+            if result is None:
                 return self._parse_basic_attachment_fallback(response.text)
+            
+            # Map categories and priorities to valid enum values
+            if 'suggested_category' in result:
+                result['suggested_category'] = self._map_category_to_enum(result['suggested_category'])
+            if 'suggested_priority' in result:
+                result['suggested_priority'] = self._map_priority_to_enum(result['suggested_priority'])
+            return result
                 
-        except Exception as e:
-            print(f"Error analyzing attachment: {str(e)}")
+        except Exception:
+            logger.exception("Error analyzing attachment")
             return {
                 "attachment_type": "unknown",
                 "content_description": "Error analyzing attachment",
@@ -545,7 +1223,8 @@ class GeminiTicketProcessor:
             }
         }
 
-    def _map_category_to_enum(self, ai_category: str) -> str:
+    @staticmethod
+    def _map_category_to_enum(ai_category: str) -> str:
         """
         Map AI-generated category to valid TicketCategoryEnum value
         
@@ -557,43 +1236,10 @@ class GeminiTicketProcessor:
         """
         if not ai_category or not isinstance(ai_category, str):
             return "general"
-            
-        ai_category_lower = ai_category.lower()
-        
-        # Technical categories
-        if any(keyword in ai_category_lower for keyword in [
-            'technical', 'tech', 'system', 'software', 'hardware', 'network',
-            'authentication', 'login', 'password', 'error', 'bug', 'crash',
-            'connection', 'database', 'server', 'api', 'integration', 'security'
-        ]):
-            return "technical"
-        
-        # Billing categories  
-        elif any(keyword in ai_category_lower for keyword in [
-            'billing', 'payment', 'invoice', 'charge', 'refund', 'price',
-            'cost', 'subscription', 'plan', 'finance', 'money', 'credit'
-        ]):
-            return "billing"
-        
-        # Complaint categories
-        elif any(keyword in ai_category_lower for keyword in [
-            'complaint', 'dissatisfied', 'unhappy', 'frustrated', 'angry',
-            'service', 'support', 'quality', 'experience', 'issue', 'problem'
-        ]):
-            return "complaint"
-        
-        # Feature request categories
-        elif any(keyword in ai_category_lower for keyword in [
-            'feature', 'request', 'enhancement', 'improvement', 'suggestion',
-            'new', 'add', 'functionality', 'capability', 'wishlist'
-        ]):
-            return "feature_request"
-        
-        # Default to general
-        else:
-            return "general"
+        return _category_for(ai_category.lower())
 
-    def _map_priority_to_enum(self, ai_priority: str) -> str:
+    @staticmethod
+    def _map_priority_to_enum(ai_priority: str) -> str:
         """
         Map AI-generated priority to valid TicketPriorityEnum value
         
@@ -605,26 +1251,19 @@ class GeminiTicketProcessor:
         """
         if not ai_priority or not isinstance(ai_priority, str):
             return "medium"
-            
-        ai_priority_lower = ai_priority.lower()
-        
-        if any(keyword in ai_priority_lower for keyword in ['urgent', 'critical', 'emergency', 'immediate']):
-            return "urgent"
-        elif any(keyword in ai_priority_lower for keyword in ['high', 'important', 'serious']):
-            return "high"
-        elif any(keyword in ai_priority_lower for keyword in ['low', 'minor', 'trivial']):
-            return "low"
-        else:
-            return "medium"
+        return _priority_for(ai_priority.lower())
 
 # Global instance for reuse
 gemini_processor = None
+_init_lock = threading.Lock()
 
 def get_gemini_processor():
-    """Get or create Gemini processor instance"""
+    """Get or create Gemini processor instance (built once even when first requests race)"""
     global gemini_processor
     if gemini_processor is None:
-        gemini_processor = GeminiTicketProcessor()
+        with _init_lock:
+            if gemini_processor is None:
+                gemini_processor = GeminiTicketProcessor()
     return gemini_processor
 
 if __name__ == "__main__":
@@ -635,4 +1274,4 @@ if __name__ == "__main__":
     result = processor.process_bengali_complaint(test_bengali)
     
     print("Processing Result:")
-    print(json.dumps(result, indent=2, ensure_ascii=False)) 
\ No newline at end of file
+    print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()) 
\ No newline at end of file
@@ -14,6 +14,7 @@ import logging
 from pathlib import Path
 import threading
 import time
+from collections import OrderedDict
 from functools import lru_cache
 
 # Import configuration
@@ -26,6 +27,51 @@ logger = logging.getLogger(__name__)
 # Thread lock for singleton pattern
 _lock = threading.Lock()
 
+# Query cache sizing
+SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL = 60.0
+EMBEDDING_CACHE_SIZE = 1024
+STATS_CACHE_TTL = 30.0
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache with optional per-entry expiry"""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Any, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace and case; the MiniLM encoder is uncased, so embeddings are unchanged"""
+    return " ".join(query.split()).lower()
+
 
 class RAGService:
     """RAG Service for vector-based ticket similarity search using ChromaDB with singleton pattern"""
@@ -60,6 +106,11 @@ class RAGService:
         # Initialize sentence transformer model with caching
         self.encoder = self._get_sentence_transformer()
         
+        # Query-side caches; cleared whenever the collection is rebuilt
+        self._search_cache = _TTLCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+        self._embedding_cache = _TTLCache(EMBEDDING_CACHE_SIZE)
+        self._stats_cache = _TTLCache(2, STATS_CACHE_TTL)
+        
         # Initialize ChromaDB client
         self._initialize_chromadb()
         
@@ -159,6 +210,8 @@ class RAGService:
                 name=self.collection_name,
                 metadata={"hnsw:space": "cosine"}
             )
+            self._search_cache.clear()
+            self._stats_cache.clear()
             
             # Process in batches to avoid memory issues
             batch_size = 100
@@ -217,6 +270,9 @@ class RAGService:
                     logger.error(f"Failed to add batch to ChromaDB: {e}")
                     continue
             
+            self._search_cache.clear()
+            self._stats_cache.clear()
+            
             logger.info(f"Successfully initialized ChromaDB with {total_processed} tickets")
             return total_processed
             
@@ -224,6 +280,22 @@ class RAGService:
             logger.error(f"Error initializing ChromaDB database: {str(e)}")
             raise
     
+    def embed_query(self, query: str) -> List[List[float]]:
+        """
+        Embed a normalized query, memoized so repeated searches skip the encoder
+        
+        Args:
+            query: Normalized search query
+            
+        Returns:
+            Single-row embedding matrix ready for ChromaDB
+        """
+        embedding = self._embedding_cache.get(query)
+        if embedding is None:
+            embedding = self.encoder.encode([query]).tolist()
+            self._embedding_cache.set(query, embedding)
+        return embedding
+    
     def search_similar_tickets(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
         Search for similar tickets using ChromaDB vector similarity
@@ -243,6 +315,12 @@ class RAGService:
                 
             max_results = max(1, min(max_results, 20))  # Limit between 1-20
             
+            normalized_query = _normalize_query(query)
+            cache_key = (normalized_query, max_results)
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                return [dict(result) for result in cached]
+            
             # Ensure we have a valid collection
             if not hasattr(self, 'collection') or self.collection is None:
                 logger.warning("Collection not initialized, attempting to reinitialize...")
@@ -255,7 +333,7 @@ class RAGService:
             
             # Check if collection has data
             try:
-                count = self.collection.count()
+                count = self._collection_count()
                 if count == 0:
                     logger.warning("ChromaDB collection is empty")
                     return []
@@ -265,7 +343,7 @@ class RAGService:
             
             # Generate embedding for the query
             try:
-                query_embedding = self.encoder.encode([query.strip()])
+                query_embedding = self.embed_query(normalized_query)
             except Exception as e:
                 logger.error(f"Failed to encode query: {e}")
                 return []
@@ -273,7 +351,7 @@ class RAGService:
             # Search in ChromaDB
             try:
                 results = self.collection.query(
-                    query_embeddings=query_embedding.tolist(),
+                    query_embeddings=query_embedding,
                     n_results=max_results,
                     include=['documents', 'metadatas', 'distances']
                 )
@@ -311,6 +389,8 @@ class RAGService:
                         logger.warning(f"Error formatting result {i}: {e}")
                         continue
             
+            self._search_cache.set(cache_key, [dict(result) for result in formatted_results])
+            
             logger.info(f"ChromaDB search for '{query[:50]}...' returned {len(formatted_results)} results")
             return formatted_results
             
@@ -318,10 +398,21 @@ class RAGService:
             logger.error(f"Error searching similar tickets: {str(e)}")
             return []
     
+    def _collection_count(self) -> int:
+        """Collection size, cached briefly since count() scans the collection"""
+        count = self._stats_cache.get("count")
+        if count is None:
+            count = self.collection.count() if hasattr(self, 'collection') and self.collection else 0
+            self._stats_cache.set("count", count)
+        return count
+    
     def get_database_stats(self) -> Dict[str, Any]:
-        """Get ChromaDB database statistics"""
+        """Get ChromaDB database statistics (cached for STATS_CACHE_TTL seconds)"""
+        cached = self._stats_cache.get("stats")
+        if cached is not None:
+            return dict(cached)
         try:
-            count = self.collection.count() if hasattr(self, 'collection') and self.collection else 0
+            count = self._collection_count()
             
             # Get ChromaDB directory size
             chroma_path = Path("./chroma_db")
@@ -329,7 +420,7 @@ class RAGService:
             if chroma_path.exists():
                 db_size_mb = sum(f.stat().st_size for f in chroma_path.rglob('*') if f.is_file()) / (1024 * 1024)
             
-            return {
+            stats = {
                 "total_tickets": count,
                 "collection_name": self.collection_name,
                 "encoder_model": "all-MiniLM-L6-v2",
@@ -338,6 +429,8 @@ class RAGService:
                 "singleton_initialized": RAGService._initialized,
                 "database_type": "ChromaDB"
             }
+            self._stats_cache.set("stats", stats)
+            return dict(stats)
         except Exception as e:
             logger.error(f"Error getting database stats: {str(e)}")
             return {"error": str(e)}
@@ -0,0 +1,200 @@
+"""
+Semantic cache for Gemini complaint analysis
+Returns a stored result when a new complaint embeds close enough to one already analyzed
+"""
+
+import atexit
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+import orjson
+
+try:
+    import faiss
+except ImportError:  # optional: brute-force numpy search is used instead
+    faiss = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: flushes are then atomic but not serialized across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Vectors and metadata share one file so workers flushing concurrently can never pair one's vectors with another's values
+CACHE_FILE = "cache.npz"
+LOCK_FILE = "cache.lock"
+
+
+class SemanticCache:
+    """Cosine-similarity cache over L2-normalized sentence embeddings (FAISS inner-product index)"""
+
+    def __init__(self, model_name: str, threshold: float = 0.92, maxsize: int = 2048,
+                 embedding_cache_size: int = 4096, path: Optional[str] = None, flush_every: int = 64):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.embedding_cache_size = embedding_cache_size
+        self.path = path
+        self.flush_every = flush_every
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._encoder = None
+        self._index = None
+        self._vectors: Optional[np.ndarray] = None
+        self._values: List[str] = []
+        self._last_used: List[float] = []
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+        if path:
+            self._load()
+            atexit.register(self.flush)
+
+    @property
+    def encoder(self):
+        """Sentence-transformer, loaded on first use"""
+        if self._encoder is None:
+            with self._lock:
+                if self._encoder is None:
+                    from sentence_transformers import SentenceTransformer
+                    logger.info(f"Loading semantic cache encoder {self.model_name}...")
+                    self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder
+
+    def embed(self, text: str) -> np.ndarray:
+        """Normalized float32 embedding of shape (1, dim), memoized per text (read-only array)"""
+        with self._lock:
+            embedding = self._embeddings.get(text)
+            if embedding is not None:
+                self._embeddings.move_to_end(text)
+                return embedding
+
+        embedding = np.asarray(
+            self.encoder.encode([text], normalize_embeddings=True), dtype=np.float32
+        )
+        embedding.flags.writeable = False
+        if self.embedding_cache_size > 0:
+            with self._lock:
+                self._embeddings[text] = embedding
+                while len(self._embeddings) > self.embedding_cache_size:
+                    self._embeddings.popitem(last=False)
+        return embedding
+
+    def lookup(self, embedding: np.ndarray, threshold: Optional[float] = None) -> Optional[str]:
+        """
+        Find the closest stored entry
+
+        Args:
+            embedding: Query embedding from embed()
+            threshold: Minimum cosine similarity for a hit (defaults to self.threshold)
+
+        Returns:
+            The stored value when its similarity reaches the threshold, otherwise None
+        """
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            if not self._values:
+                return None
+            if self._index is not None:
+                scores, ids = self._index.search(embedding, 1)
+                score, best = float(scores[0][0]), int(ids[0][0])
+            else:
+                similarities = self._vectors @ embedding[0]
+                best = int(np.argmax(similarities))
+                score = float(similarities[best])
+            if best < 0 or score < threshold:
+                return None
+            self._last_used[best] = time.time()
+            return self._values[best]
+
+    def add(self, embedding: np.ndarray, value: str) -> None:
+        """Store a value under its embedding, evicting least recently used entries when full"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = embedding.copy()
+            else:
+                self._vectors = np.vstack([self._vectors, embedding])
+            self._values.append(value)
+            self._last_used.append(time.time())
+
+            if len(self._values) > self.maxsize:
+                # Drop the least recently used tenth in one pass so the index is rebuilt rarely
+                keep = np.argsort(self._last_used)[len(self._values) - self.maxsize + self.maxsize // 10:]
+                keep.sort()
+                self._vectors = self._vectors[keep]
+                self._values = [self._values[i] for i in keep]
+                self._last_used = [self._last_used[i] for i in keep]
+                self._index = None
+
+            if faiss is not None:
+                if self._index is None:
+                    self._rebuild_index()
+                else:
+                    self._index.add(embedding)
+
+            self._unsaved += 1
+            flush_due = self.path and self._unsaved >= self.flush_every
+        if flush_due:
+            self.flush()
+
+    def _rebuild_index(self) -> None:
+        """Build the FAISS index over the stored vectors (caller holds the lock)"""
+        self._index = faiss.IndexFlatIP(self._vectors.shape[1])
+        self._index.add(self._vectors)
+
+    def flush(self) -> None:
+        """Write the stored entries to disk (vectors and JSON metadata in one .npz) if anything changed"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._unsaved or self._vectors is None:
+                return
+            vectors = self._vectors.copy()
+            meta = {"model": self.model_name, "values": list(self._values), "last_used": list(self._last_used)}
+            self._unsaved = 0
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # API workers share the directory: one flush at a time, each a temp file + rename
+            with open(os.path.join(self.path, LOCK_FILE), 'a') as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                with tempfile.NamedTemporaryFile('wb', dir=self.path, suffix='.tmp', delete=False) as f:
+                    np.savez(f, vectors=vectors, meta=np.frombuffer(orjson.dumps(meta), dtype=np.uint8))
+                os.replace(f.name, os.path.join(self.path, CACHE_FILE))
+        except OSError as e:
+            logger.warning(f"Could not persist semantic cache: {e}")
+
+    def _load(self) -> None:
+        """Restore entries written by flush() for the same encoder model"""
+        try:
+            with np.load(os.path.join(self.path, CACHE_FILE)) as data:
+                vectors = data["vectors"]
+                meta = orjson.loads(data["meta"].tobytes())
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return
+        if (meta.get("model") != self.model_name or vectors.ndim != 2
+                or len(vectors) != len(meta.get("values", ())) or len(vectors) != len(meta.get("last_used", ()))):
+            logger.info("Discarding persisted semantic cache (different model or malformed file)")
+            return
+
+        # Keep the most recently used entries when the persisted cache is larger than maxsize
+        keep = np.sort(np.argsort(meta["last_used"])[-self.maxsize:]) if self.maxsize > 0 else []
+        if not len(keep):
+            return
+        with self._lock:
+            self._vectors = np.ascontiguousarray(vectors[keep], dtype=np.float32)
+            self._values = [meta["values"][i] for i in keep]
+            self._last_used = [meta["last_used"][i] for i in keep]
+            if faiss is not None:
+                self._rebuild_index()
+        logger.info(f"Loaded {len(self._values)} semantic cache entries from {self.path}")
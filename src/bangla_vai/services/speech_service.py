@@ -3,13 +3,228 @@ import requests
 import json
 import time
 import re
+import random
 from typing import Optional, Dict, Any
 from gtts import gTTS
 import tempfile
+import shutil
+import hashlib
+import io
+import mmap
+import asyncio
+import threading
+import httpx
+import aiofiles
+import orjson
+from collections import OrderedDict
+
+try:
+    import blake3
+except ImportError:  # optional: SIMD-accelerated hashing for upload dedup
+    blake3 = None
 
 # Import from our new configuration
 from ..core.config import settings
 
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
+
+# Sentence boundaries (Bengali dari and Latin punctuation) used to split TTS input
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[।.?!])\s+')
+
+# Any character in the Bengali Unicode block, for sanity-checking transcripts
+BENGALI_CHAR_PATTERN = re.compile(r'[\u0980-\u09FF]')
+
+# Recently used transcriptions kept in memory in front of the on-disk cache
+STT_MEMORY_CACHE_SIZE = 256
+
+# Disk cache size is enforced every this many stores rather than after each one
+STT_CACHE_EVICT_EVERY = 50
+
+# Transient ElevenLabs failures that are retried with exponential backoff
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+STT_MAX_ATTEMPTS = 4
+STT_BACKOFF_INITIAL = 0.5
+STT_BACKOFF_MAX = 8.0
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker: after fail_max consecutive failures, calls are rejected
+    for reset_timeout seconds, then a single trial call is let through.
+    """
+    
+    def __init__(self, fail_max: int = 10, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+    
+    def allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Half-open: let one request probe the upstream
+            self.opened_at = time.monotonic()
+            return True
+        return False
+    
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.fail_max:
+            self.opened_at = time.monotonic()
+
+_stt_breaker = CircuitBreaker(fail_max=10, reset_timeout=30.0)
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Backoff delay before the next attempt, honoring a numeric Retry-After header"""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), STT_BACKOFF_MAX)
+            except ValueError:
+                pass
+    delay = min(STT_BACKOFF_INITIAL * (2 ** attempt), STT_BACKOFF_MAX)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+# Shared HTTP session/clients so TLS sessions are reused across transcriptions
+_http_session: Optional[requests.Session] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+def get_http_session() -> requests.Session:
+    """Get or create the shared pooled requests session for ElevenLabs requests"""
+    global _http_session
+    if _http_session is None:
+        _http_session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        _http_session.mount('https://', adapter)
+    return _http_session
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get or create the shared async HTTP client for ElevenLabs requests"""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            base_url=ELEVENLABS_BASE_URL,
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=60
+        )
+    return _async_client
+
+async def close_async_client():
+    """Close the shared async HTTP client (called on application shutdown)"""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+async def probe_audio_duration(audio_file_path: str) -> Optional[float]:
+    """Return the audio duration in seconds via ffprobe, or None if unavailable"""
+    if shutil.which("ffprobe") is None:
+        return None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error", "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1", audio_file_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            return None
+        return float(stdout.decode().strip())
+    except (OSError, ValueError):
+        return None
+
+def merge_chunk_transcriptions(chunk_results, chunk_starts, chunk_sec: float, overlap: float) -> Dict[str, Any]:
+    """
+    Stitch per-chunk Scribe results into a single transcription
+    
+    Chunk i covers [start_i - overlap, start_i + chunk_sec + overlap]; a word is kept only by the
+    chunk whose core window [start_i, start_i + chunk_sec) contains the word's midpoint, so words
+    in the overlap regions are not duplicated.
+    
+    Args:
+        chunk_results (list): Scribe results in chunk order
+        chunk_starts (list): Core window start (seconds) of each chunk
+        chunk_sec (float): Core window length in seconds
+        overlap (float): Overlap added on each side of a chunk in seconds
+        
+    Returns:
+        Dict shaped like a Scribe result with text, words and language fields
+    """
+    words = []
+    texts = []
+    for result, core_start in zip(chunk_results, chunk_starts):
+        offset = max(core_start - overlap, 0.0)
+        core_end = core_start + chunk_sec
+        chunk_words = result.get('words') or []
+        if not chunk_words:
+            texts.append(result.get('text', '').strip())
+            continue
+        kept = []
+        for word in chunk_words:
+            start = word.get('start', 0.0) + offset
+            end = word.get('end', start - offset) + offset
+            if core_start <= (start + end) / 2 < core_end:
+                kept.append({**word, 'start': start, 'end': end})
+        words.extend(kept)
+        texts.append(''.join(word.get('text', '') for word in kept).strip())
+    
+    first = chunk_results[0]
+    return {
+        'language_code': first.get('language_code'),
+        'language_probability': min(r.get('language_probability', 0) for r in chunk_results),
+        'text': ' '.join(text for text in texts if text),
+        'words': words,
+        'chunks': len(chunk_results)
+    }
+
+def new_audio_hasher():
+    """Create an incremental hasher used to key the transcription cache (BLAKE3 when installed)"""
+    if blake3 is not None:
+        return blake3.blake3()
+    return hashlib.blake2b(digest_size=16)
+
+def hash_audio_file(audio_file_path: str) -> str:
+    """Compute the transcription cache key of a file over a memory map, without copying it into Python"""
+    with open(audio_file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return new_audio_hasher().hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if blake3 is not None:
+                return blake3.blake3(mm, max_threads=blake3.blake3.AUTO).hexdigest()
+            hasher = new_audio_hasher()
+            hasher.update(mm)
+            return hasher.hexdigest()
+
+def hash_audio_bytes(audio_bytes: bytes) -> str:
+    """Compute the transcription cache key for raw audio bytes"""
+    hasher = new_audio_hasher()
+    hasher.update(audio_bytes)
+    return hasher.hexdigest()
+
+def evict_lru_files(cache_dir: str, max_mb: int):
+    """Delete least recently used files in cache_dir once its total size exceeds max_mb"""
+    max_bytes = max_mb * 1024 * 1024
+    with os.scandir(cache_dir) as it:
+        entries = [(entry.path, entry.stat()) for entry in it if entry.is_file()]
+    total = sum(stat.st_size for _, stat in entries)
+    if total <= max_bytes:
+        return
+    for path, stat in sorted(entries, key=lambda item: item[1].st_atime):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # Already evicted by a concurrent writer
+        total -= stat.st_size
+        if total <= max_bytes:
+            break
+
 class BengaliSTT:
     def __init__(self):
         """Initialize the Bengali Speech-to-Text client with ElevenLabs Scribe API"""
@@ -17,11 +232,108 @@ class BengaliSTT:
         if not self.api_key:
             raise ValueError("ELEVENLABS_API_KEY not found in environment variables")
         
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = ELEVENLABS_BASE_URL
         self.headers = {
             "Accept": "application/json",
             "xi-api-key": self.api_key
         }
+        # In-flight transcriptions keyed by cache path, shared by concurrent identical uploads
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Memory tier of the transcription cache, keyed by cache path
+        self._memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_lock = threading.Lock()
+        self._stores_since_evict = 0
+    
+    def _build_request_data(self, language: str) -> Dict[str, Any]:
+        """Build the Scribe API form fields for the given language"""
+        # Map language to proper language code
+        language_code_map = {
+            'bengali': 'ben',
+            'bengali_bd': 'ben',  # Bangladesh Bengali
+            'bengali_in': 'ben',  # Indian Bengali
+            'ben': 'ben'
+        }
+        
+        lang_code = language_code_map.get(language.lower(), 'ben')
+        
+        return {
+            'model_id': 'scribe_v1',  # Use stable model instead of experimental
+            'language_code': lang_code,  # Explicitly set Bengali language code
+            'diarize': False,  # Disable speaker diarization for simpler output
+            'timestamps_granularity': 'word',  # Word-level timestamps
+            'tag_audio_events': True,  # Keep audio event tagging
+            'temperature': 0.0  # Use lowest temperature for most deterministic results
+        }
+    
+    def _cache_path(self, content_hash: str, language: str) -> str:
+        """Path of the cached transcription for an audio hash and language"""
+        lang_code = self._build_request_data(language)['language_code']
+        return os.path.join(settings.STT_CACHE_DIR, f"{content_hash}_{lang_code}.json")
+    
+    def _cache_lookup(self, content_hash: str, language: str) -> Optional[Dict[str, Any]]:
+        """Return a previously cached transcription result, if any"""
+        cache_path = self._cache_path(content_hash, language)
+        with self._memory_lock:
+            result = self._memory_cache.get(cache_path)
+            if result is not None:
+                self._memory_cache.move_to_end(cache_path)
+        if result is not None:
+            return {**result, 'cached': True}
+        try:
+            with open(cache_path, 'rb') as f:
+                result = orjson.loads(f.read())
+            os.utime(cache_path)  # Refresh recency for LRU eviction
+            print(f"Transcription cache hit: {content_hash}")
+            self._remember(cache_path, result)
+            return {**result, 'cached': True}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading transcription cache: {str(e)}")
+            return None
+    
+    def _remember(self, cache_path: str, result: Dict[str, Any]):
+        """Add a result to the memory tier, dropping the least recently used past its size"""
+        with self._memory_lock:
+            self._memory_cache[cache_path] = result
+            self._memory_cache.move_to_end(cache_path)
+            while len(self._memory_cache) > STT_MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
+    
+    def _cache_store(self, content_hash: str, language: str, result: Dict[str, Any]):
+        """Persist a successful transcription result in the cache"""
+        self._remember(self._cache_path(content_hash, language), dict(result))
+        try:
+            os.makedirs(settings.STT_CACHE_DIR, exist_ok=True)
+            # Write to a temp file and rename so readers never see a partial entry
+            with tempfile.NamedTemporaryFile('wb', dir=settings.STT_CACHE_DIR, suffix='.tmp', delete=False) as f:
+                f.write(orjson.dumps(result))
+            os.replace(f.name, self._cache_path(content_hash, language))
+            with self._memory_lock:
+                self._stores_since_evict += 1
+                evict = self._stores_since_evict >= STT_CACHE_EVICT_EVERY
+                if evict:
+                    self._stores_since_evict = 0
+            if evict:
+                evict_lru_files(settings.STT_CACHE_DIR, settings.STT_CACHE_MAX_MB)
+        except Exception as e:
+            print(f"Error writing transcription cache: {str(e)}")
+    
+    def _check_detected_language(self, result: Dict[str, Any]):
+        """Warn when the detected language does not look like Bengali"""
+        detected_lang = result.get('language_code', 'unknown')
+        lang_probability = result.get('language_probability', 0)
+        
+        print(f"Detected language: {detected_lang}")
+        print(f"Language confidence: {lang_probability:.2f}")
+        
+        # Check if language detection seems incorrect
+        if detected_lang not in ['ben', 'bengali'] and lang_probability < 0.8:
+            print(f"⚠️  Warning: Language detected as '{detected_lang}' with low confidence ({lang_probability:.2f})")
+            print("The transcription might not be accurate. Consider:")
+            print("1. Ensuring the audio is clear Bengali speech")
+            print("2. Checking if the audio file is corrupted")
+            print("3. Trying with a different audio sample")
     
     def transcribe_audio_file(self, audio_file_path: str, language: str = "bengali") -> Optional[Dict[str, Any]]:
         """
@@ -40,68 +352,254 @@ class BengaliSTT:
                 print(f"Error: Audio file '{audio_file_path}' not found")
                 return None
             
-            # Prepare the file for upload
+            # Hash over a memory map so cache hits never load the audio into Python
+            content_hash = hash_audio_file(audio_file_path)
+            cached_result = self._cache_lookup(content_hash, language)
+            if cached_result is not None:
+                return cached_result
+            
+            data = self._build_request_data(language)
+            
+            print(f"Uploading and transcribing '{audio_file_path}'...")
+            print(f"Using model: {data['model_id']}")
+            print(f"Language code: {data['language_code']}")
+            print("This may take a few moments...")
+            
+            # Make the API request over the pooled session
             with open(audio_file_path, 'rb') as audio_file:
                 files = {
                     'file': (os.path.basename(audio_file_path), audio_file, 'audio/mpeg')
                 }
-                
-                # Map language to proper language code
-                language_code_map = {
-                    'bengali': 'ben',
-                    'bengali_bd': 'ben',  # Bangladesh Bengali
-                    'bengali_in': 'ben',  # Indian Bengali
-                    'ben': 'ben'
-                }
-                
-                lang_code = language_code_map.get(language.lower(), 'ben')
-                
-                data = {
-                    'model_id': 'scribe_v1',  # Use stable model instead of experimental
-                    'language_code': lang_code,  # Explicitly set Bengali language code
-                    'diarize': False,  # Disable speaker diarization for simpler output
-                    'timestamps_granularity': 'word',  # Word-level timestamps
-                    'tag_audio_events': True,  # Keep audio event tagging
-                    'temperature': 0.0  # Use lowest temperature for most deterministic results
-                }
-                
-                print(f"Uploading and transcribing '{audio_file_path}'...")
-                print(f"Using model: {data['model_id']}")
-                print(f"Language code: {data['language_code']}")
-                print("This may take a few moments...")
-                
-                # Make the API request
-                response = requests.post(
+                response = get_http_session().post(
                     f"{self.base_url}/speech-to-text",
                     headers=self.headers,
                     files=files,
                     data=data
                 )
+            
+            if response.status_code == 200:
+                result = response.json()
                 
-                if response.status_code == 200:
-                    result = response.json()
-                    
-                    # Validate that the detected language is correct
-                    detected_lang = result.get('language_code', 'unknown')
-                    lang_probability = result.get('language_probability', 0)
-                    
-                    print(f"Detected language: {detected_lang}")
-                    print(f"Language confidence: {lang_probability:.2f}")
-                    
-                    # Check if language detection seems incorrect
-                    if detected_lang not in ['ben', 'bengali'] and lang_probability < 0.8:
-                        print(f"⚠️  Warning: Language detected as '{detected_lang}' with low confidence ({lang_probability:.2f})")
-                        print("The transcription might not be accurate. Consider:")
-                        print("1. Ensuring the audio is clear Bengali speech")
-                        print("2. Checking if the audio file is corrupted")
-                        print("3. Trying with a different audio sample")
+                # Validate that the detected language is correct
+                self._check_detected_language(result)
+                
+                self._cache_store(content_hash, language, result)
+                return result
+            else:
+                print(f"Error: API request failed with status code {response.status_code}")
+                print(f"Response: {response.text}")
+                return None
                     
+        except Exception as e:
+            print(f"Error during transcription: {str(e)}")
+            return None
+    
+    async def atranscribe_audio_file(self, audio_file_path: str, language: str = "bengali",
+                                     content_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Async variant of transcribe_audio_file using the shared pooled HTTP client
+        
+        Args:
+            audio_file_path (str): Path to the audio file
+            language (str): Language for transcription (default: bengali)
+            content_hash (str): Cache key of the audio (see new_audio_hasher), if already computed
+            
+        Returns:
+            Dict containing transcription result or None if failed
+        """
+        if content_hash is None:
+            try:
+                content_hash = await asyncio.to_thread(hash_audio_file, audio_file_path)
+            except OSError as e:
+                print(f"Error reading audio file: {str(e)}")
+                return None
+        
+        cached_result = await asyncio.to_thread(self._cache_lookup, content_hash, language)
+        if cached_result is not None:
+            return cached_result
+        
+        # Identical audio already being transcribed: wait for that request instead of sending another
+        key = self._cache_path(content_hash, language)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._atranscribe_path(audio_file_path, language, content_hash))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            print(f"Joining in-flight transcription: {content_hash}")
+        return await asyncio.shield(task)
+    
+    async def _atranscribe_path(self, audio_file_path: str, language: str = "bengali",
+                                content_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Transcribe a file on disk, splitting long recordings into parallel chunks"""
+        try:
+            # Check if file exists
+            if not os.path.exists(audio_file_path):
+                print(f"Error: Audio file '{audio_file_path}' not found")
+                return None
+            
+            # Long recordings are split and transcribed in parallel
+            duration = await probe_audio_duration(audio_file_path)
+            if duration is not None and duration > settings.STT_CHUNK_THRESHOLD_SEC:
+                result = await self._split_and_transcribe(audio_file_path, duration, language)
+                if result is not None:
+                    if content_hash is not None:
+                        await asyncio.to_thread(self._cache_store, content_hash, language, result)
                     return result
-                else:
+                print("Chunked transcription failed, falling back to a single request")
+            
+            # Hand the open file to httpx so it is streamed in chunks instead of read fully into memory
+            with open(audio_file_path, 'rb') as audio_file:
+                return await self.atranscribe_fileobj(
+                    audio_file, os.path.basename(audio_file_path), language, content_hash=content_hash
+                )
+                
+        except Exception as e:
+            print(f"Error during transcription: {str(e)}")
+            return None
+    
+    async def _split_and_transcribe(self, audio_file_path: str, duration: float,
+                                    language: str = "bengali") -> Optional[Dict[str, Any]]:
+        """
+        Split a long recording into overlapping chunks with ffmpeg and transcribe them concurrently
+        
+        Args:
+            audio_file_path (str): Path to the audio file
+            duration (float): Duration of the audio in seconds
+            language (str): Language for transcription (default: bengali)
+            
+        Returns:
+            Merged transcription result or None if splitting or any chunk failed
+        """
+        if shutil.which("ffmpeg") is None:
+            return None
+        
+        chunk_sec = settings.STT_CHUNK_SEC
+        overlap = settings.STT_CHUNK_OVERLAP_SEC
+        chunk_starts = []
+        start = 0.0
+        while start < duration:
+            chunk_starts.append(start)
+            start += chunk_sec
+        
+        ext = os.path.splitext(audio_file_path)[1] or '.mp3'
+        with tempfile.TemporaryDirectory(prefix="stt_chunks_") as tmp_dir:
+            async def cut_chunk(index: int, core_start: float) -> Optional[str]:
+                chunk_path = os.path.join(tmp_dir, f"chunk_{index:03d}{ext}")
+                offset = max(core_start - overlap, 0.0)
+                process = await asyncio.create_subprocess_exec(
+                    "ffmpeg", "-v", "error", "-y", "-ss", f"{offset:.3f}",
+                    "-t", f"{chunk_sec + 2 * overlap:.3f}", "-i", audio_file_path,
+                    "-vn", "-c", "copy", chunk_path,
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                await process.wait()
+                return chunk_path if process.returncode == 0 else None
+            
+            async def transcribe_chunk(chunk_path: str) -> Optional[Dict[str, Any]]:
+                with open(chunk_path, 'rb') as chunk_file:
+                    return await self._apost_speech_to_text(chunk_file, os.path.basename(chunk_path), language)
+            
+            chunk_paths = await asyncio.gather(
+                *(cut_chunk(i, core_start) for i, core_start in enumerate(chunk_starts))
+            )
+            if not all(chunk_paths):
+                print("Error: ffmpeg failed to split the audio")
+                return None
+            
+            print(f"Transcribing {len(chunk_paths)} chunks of '{audio_file_path}' in parallel...")
+            chunk_results = await asyncio.gather(*(transcribe_chunk(p) for p in chunk_paths))
+        
+        if not all(chunk_results):
+            return None
+        
+        result = merge_chunk_transcriptions(chunk_results, chunk_starts, chunk_sec, overlap)
+        self._check_detected_language(result)
+        return result
+    
+    async def _apost_speech_to_text(self, audio_file, filename: str, language: str = "bengali",
+                                    content_type: str = 'audio/mpeg') -> Optional[Dict[str, Any]]:
+        """
+        Send one audio file object to the Scribe API over the shared async client
+        
+        429/5xx responses and transport errors are retried with exponential backoff and
+        jitter; repeated failures open a circuit breaker so a dead upstream fails fast.
+        """
+        if not _stt_breaker.allow_request():
+            print("Error: ElevenLabs circuit breaker is open, skipping request")
+            return None
+        
+        client = get_async_client()
+        data = self._build_request_data(language)
+        start_position = audio_file.tell()
+        
+        for attempt in range(STT_MAX_ATTEMPTS):
+            if attempt:
+                audio_file.seek(start_position)
+            files = {
+                'file': (filename, audio_file, content_type or 'audio/mpeg')
+            }
+            
+            response = None
+            try:
+                response = await client.post(
+                    "/speech-to-text",
+                    headers=self.headers,
+                    files=files,
+                    data=data,
+                    timeout=60
+                )
+            except httpx.TransportError as e:
+                print(f"ElevenLabs request error (attempt {attempt + 1}): {str(e)}")
+            else:
+                if response.status_code == 200:
+                    _stt_breaker.record_success()
+                    return response.json()
+                if response.status_code not in RETRYABLE_STATUS_CODES:
                     print(f"Error: API request failed with status code {response.status_code}")
                     print(f"Response: {response.text}")
                     return None
-                    
+                print(f"ElevenLabs returned {response.status_code} (attempt {attempt + 1})")
+            
+            if attempt < STT_MAX_ATTEMPTS - 1:
+                await asyncio.sleep(_retry_delay(attempt, response))
+        
+        _stt_breaker.record_failure()
+        print(f"Error: API request failed after {STT_MAX_ATTEMPTS} attempts")
+        return None
+    
+    async def atranscribe_fileobj(self, audio_file, filename: str, language: str = "bengali",
+                                  content_hash: Optional[str] = None,
+                                  content_type: str = 'audio/mpeg') -> Optional[Dict[str, Any]]:
+        """
+        Transcribe audio from an open binary file object (e.g. an upload spool) without touching disk
+        
+        Args:
+            audio_file: Readable binary file object positioned at the start of the audio
+            filename (str): Filename reported to the API
+            language (str): Language for transcription (default: bengali)
+            content_hash (str): Cache key of the audio (see new_audio_hasher), if already computed
+            content_type (str): MIME type of the audio
+            
+        Returns:
+            Dict containing transcription result or None if failed
+        """
+        try:
+            if content_hash is not None:
+                cached_result = await asyncio.to_thread(self._cache_lookup, content_hash, language)
+                if cached_result is not None:
+                    return cached_result
+            
+            print(f"Uploading and transcribing '{filename}' (async)...")
+            
+            result = await self._apost_speech_to_text(audio_file, filename, language, content_type)
+            if result is not None:
+                self._check_detected_language(result)
+                if content_hash is not None:
+                    await asyncio.to_thread(self._cache_store, content_hash, language, result)
+            return result
+                
         except Exception as e:
             print(f"Error during transcription: {str(e)}")
             return None
@@ -121,8 +619,8 @@ class BengaliSTT:
                 elif 'transcription' in transcription_result:
                     f.write(transcription_result['transcription'])
                 else:
-                    # Write the entire result if structure is different
-                    f.write(str(transcription_result))
+                    # Write the entire result as JSON if structure is different
+                    f.write(orjson.dumps(transcription_result, option=orjson.OPT_INDENT_2).decode())
             
             print(f"Transcription saved to '{output_file}'")
             
@@ -135,6 +633,61 @@ class BengaliTTS:
         """Initialize the Bengali Text-to-Speech client"""
         pass
     
+    def _cache_path(self, text: str, slow: bool) -> str:
+        """Path of the cached MP3 for a (text, slow) pair"""
+        key = hashlib.blake2b(f"{text}\0{slow}".encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(settings.TTS_CACHE_DIR, f"{key}.mp3")
+    
+    def _cache_fetch(self, cache_path: str, output_path: Optional[str]) -> Optional[str]:
+        """Serve a cached MP3, copying it to output_path when one is requested"""
+        try:
+            os.utime(cache_path)  # Refresh recency for LRU eviction (doubles as the existence check)
+        except FileNotFoundError:
+            return None
+        if output_path is None:
+            return cache_path
+        shutil.copyfile(cache_path, output_path)
+        print(f"Speech cache hit, saved to '{output_path}'")
+        return output_path
+    
+    def _cache_store(self, audio_path: str, cache_path: str):
+        """Add a generated MP3 to the cache and evict least recently used entries"""
+        try:
+            os.makedirs(settings.TTS_CACHE_DIR, exist_ok=True)
+            # Copy to a temp name and rename so concurrent readers never see a partial MP3
+            with open(audio_path, 'rb') as src, tempfile.NamedTemporaryFile(
+                    'wb', dir=settings.TTS_CACHE_DIR, suffix='.tmp', delete=False) as f:
+                shutil.copyfileobj(src, f)
+            os.replace(f.name, cache_path)
+            self._evict_cache()
+        except Exception as e:
+            print(f"Error writing speech cache: {str(e)}")
+    
+    def _cache_read(self, cache_path: str) -> Optional[bytes]:
+        """Return cached MP3 bytes, or None on a cache miss"""
+        try:
+            with open(cache_path, 'rb') as f:
+                audio_bytes = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(cache_path)  # Refresh recency for LRU eviction
+        return audio_bytes
+    
+    def _cache_store_bytes(self, audio_bytes: bytes, cache_path: str):
+        """Add generated MP3 bytes to the cache and evict least recently used entries"""
+        try:
+            os.makedirs(settings.TTS_CACHE_DIR, exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=settings.TTS_CACHE_DIR, suffix='.tmp', delete=False) as f:
+                f.write(audio_bytes)
+            os.replace(f.name, cache_path)
+            self._evict_cache()
+        except Exception as e:
+            print(f"Error writing speech cache: {str(e)}")
+    
+    def _evict_cache(self):
+        """Delete least recently used cache files once the cache exceeds TTS_CACHE_MAX_MB"""
+        evict_lru_files(settings.TTS_CACHE_DIR, settings.TTS_CACHE_MAX_MB)
+    
     def text_to_speech(self, text: str, output_path: str = None, slow: bool = False) -> str:
         """
         Convert Bengali text to speech and save as audio file
@@ -148,6 +701,11 @@ class BengaliTTS:
             str: Path to the generated audio file
         """
         try:
+            cache_path = self._cache_path(text, slow)
+            cached_path = self._cache_fetch(cache_path, output_path)
+            if cached_path:
+                return cached_path
+            
             # Create TTS object for Bengali
             tts = gTTS(text=text, lang='bn', slow=slow)
             
@@ -159,6 +717,7 @@ class BengaliTTS:
             
             # Save the audio file
             tts.save(output_path)
+            self._cache_store(output_path, cache_path)
             
             print(f"Speech saved to '{output_path}'")
             return output_path
@@ -167,6 +726,95 @@ class BengaliTTS:
             print(f"Error during text-to-speech conversion: {str(e)}")
             return None
     
+    def _synthesize_segment(self, text: str, slow: bool = False) -> bytes:
+        """Synthesize a single text segment and return the MP3 bytes"""
+        buffer = io.BytesIO()
+        gTTS(text=text, lang='bn', slow=slow).write_to_fp(buffer)
+        return buffer.getvalue()
+    
+    async def _asynthesize_segment(self, text: str, slow: bool = False) -> bytes:
+        """Synthesize a single text segment in a worker thread (gTTS only exposes a blocking API)"""
+        return await asyncio.to_thread(self._synthesize_segment, text, slow)
+    
+    async def atext_to_speech(self, text: str, output_path: str = None, slow: bool = False) -> Optional[str]:
+        """
+        Async variant of text_to_speech that synthesizes sentences concurrently
+        
+        gTTS latency is per request rather than per character, so each sentence is
+        synthesized in parallel worker threads and the MP3 segments (CBR frames)
+        are concatenated in order.
+        
+        Args:
+            text (str): Bengali text to convert to speech
+            output_path (str): Path to save the audio file (optional)
+            slow (bool): Whether to speak slowly
+            
+        Returns:
+            str: Path to the generated audio file
+        """
+        try:
+            cache_path = self._cache_path(text, slow)
+            cached_path = await asyncio.to_thread(self._cache_fetch, cache_path, output_path)
+            if cached_path:
+                return cached_path
+            
+            segments = [segment for segment in SENTENCE_SPLIT_PATTERN.split(text.strip()) if segment.strip()]
+            if not segments:
+                segments = [text]
+            
+            audio_chunks = await asyncio.gather(
+                *[self._asynthesize_segment(segment, slow) for segment in segments]
+            )
+            
+            # If no output path specified, create a temporary file
+            if output_path is None:
+                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
+                output_path = temp_file.name
+                temp_file.close()
+            
+            async with aiofiles.open(output_path, 'wb') as f:
+                await f.write(b''.join(audio_chunks))
+            await asyncio.to_thread(self._cache_store, output_path, cache_path)
+            
+            print(f"Speech saved to '{output_path}' ({len(segments)} segments)")
+            return output_path
+            
+        except Exception as e:
+            print(f"Error during text-to-speech conversion: {str(e)}")
+            return None
+    
+    async def asynthesize(self, text: str, slow: bool = False) -> Optional[bytes]:
+        """
+        Convert Bengali text to MP3 bytes in memory, without writing an output file
+        
+        Args:
+            text (str): Bengali text to convert to speech
+            slow (bool): Whether to speak slowly
+            
+        Returns:
+            bytes: MP3 audio, or None if synthesis failed
+        """
+        try:
+            cache_path = self._cache_path(text, slow)
+            cached_bytes = await asyncio.to_thread(self._cache_read, cache_path)
+            if cached_bytes is not None:
+                return cached_bytes
+            
+            segments = [segment for segment in SENTENCE_SPLIT_PATTERN.split(text.strip()) if segment.strip()]
+            if not segments:
+                segments = [text]
+            
+            audio_chunks = await asyncio.gather(
+                *[self._asynthesize_segment(segment, slow) for segment in segments]
+            )
+            audio_bytes = b''.join(audio_chunks)
+            await asyncio.to_thread(self._cache_store_bytes, audio_bytes, cache_path)
+            return audio_bytes
+            
+        except Exception as e:
+            print(f"Error during text-to-speech conversion: {str(e)}")
+            return None
+    
     def save_text_to_file(self, text: str, output_file: str = "bengali_text.txt"):
         """
         Save Bengali text to a text file
@@ -233,8 +881,7 @@ def main():
             print("="*50)
             
             # Check if the result looks like Bengali (contains Bengali characters)
-            bengali_pattern = r'[\u0980-\u09FF]'  # Bengali Unicode range
-            has_bengali = bool(re.search(bengali_pattern, transcript_text))
+            has_bengali = bool(BENGALI_CHAR_PATTERN.search(transcript_text))
             
             if not has_bengali and detected_lang not in ['ben', 'bengali']:
                 print("⚠️  WARNING: The transcription does not contain Bengali characters!")
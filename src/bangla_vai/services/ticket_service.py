@@ -1,9 +1,13 @@
 import os
 import json
 import re
+import threading
 from typing import Dict, Any, List
 from .ai_service import get_gemini_processor
 
+# Runs of Bengali characters, for keyword extraction
+BENGALI_WORD_PATTERN = re.compile(r'\b[\u0980-\u09FF]+\b')
+
 # Hard-coded constants for POC
 CATEGORIES = {
     'technical': 'Technical Issue',
@@ -75,28 +79,41 @@ class IntelligentTicketProcessor:
         try:
             # First get AI analysis from Gemini
             ai_analysis = self.gemini_processor.process_bengali_complaint(transcribed_text)
-            
-            # Extract structured data following the pattern
-            extracted_data = {
-                'category': self.extract_category(transcribed_text, ai_analysis),
-                'subcategory': self.extract_subcategory(transcribed_text, ai_analysis),
-                'priority': self.detect_urgency_keywords(transcribed_text, ai_analysis),
-                'product': self.identify_product_mentions(transcribed_text, ai_analysis),
-                'description': self.clean_and_format_description(transcribed_text, ai_analysis),
-                'title': self.generate_ticket_title(transcribed_text, ai_analysis),
-                'ai_analysis': ai_analysis,  # Include full AI analysis
-                'keywords': self.extract_keywords(transcribed_text),
-                'sentiment': ai_analysis.get('sentiment', 'neutral'),
-                'urgency_indicators': ai_analysis.get('urgency_indicators', [])
-            }
-            
-            return extracted_data
+            return self._extract_ticket_data(transcribed_text, ai_analysis)
             
         except Exception as e:
             print(f"Error in intelligent processing: {str(e)}")
             # Return fallback structure
             return self._get_fallback_data(transcribed_text)
     
+    async def aprocess_bengali_voice_input(self, transcribed_text: str) -> Dict[str, Any]:
+        """Async peer of process_bengali_voice_input (awaits the Gemini analysis natively)"""
+        try:
+            ai_analysis = await self.gemini_processor.aprocess_bengali_complaint(transcribed_text)
+            return self._extract_ticket_data(transcribed_text, ai_analysis)
+            
+        except Exception as e:
+            print(f"Error in intelligent processing: {str(e)}")
+            return self._get_fallback_data(transcribed_text)
+    
+    def _extract_ticket_data(self, transcribed_text: str, ai_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract structured ticket data from the text and its AI analysis"""
+        # Extract structured data following the pattern
+        extracted_data = {
+            'category': self.extract_category(transcribed_text, ai_analysis),
+            'subcategory': self.extract_subcategory(transcribed_text, ai_analysis),
+            'priority': self.detect_urgency_keywords(transcribed_text, ai_analysis),
+            'product': self.identify_product_mentions(transcribed_text, ai_analysis),
+            'description': self.clean_and_format_description(transcribed_text, ai_analysis),
+            'title': self.generate_ticket_title(transcribed_text, ai_analysis),
+            'ai_analysis': ai_analysis,  # Include full AI analysis
+            'keywords': self.extract_keywords(transcribed_text),
+            'sentiment': ai_analysis.get('sentiment', 'neutral'),
+            'urgency_indicators': ai_analysis.get('urgency_indicators', [])
+        }
+        
+        return extracted_data
+    
     def extract_category(self, transcribed_text: str, ai_analysis: Dict[str, Any]) -> str:
         """
         Extract category from transcribed text using AI analysis and keyword matching
@@ -291,7 +308,7 @@ class IntelligentTicketProcessor:
         stopwords = ['এর', 'এবং', 'বা', 'যে', 'যা', 'এক', 'একটি', 'দিয়ে', 'থেকে', 'এই', 'সেই']
         
         # Simple keyword extraction (in real implementation, you might use more sophisticated NLP)
-        words = re.findall(r'\b[\u0980-\u09FF]+\b', transcribed_text)
+        words = BENGALI_WORD_PATTERN.findall(transcribed_text)
         keywords = [word for word in words if word not in stopwords and len(word) > 2]
         
         # Return unique keywords, limited to 10
@@ -321,12 +338,15 @@ class IntelligentTicketProcessor:
 
 # Global instance for reuse
 intelligent_processor = None
+_init_lock = threading.Lock()
 
 def get_intelligent_processor():
-    """Get or create intelligent processor instance"""
+    """Get or create intelligent processor instance (built once even when first requests race)"""
     global intelligent_processor
     if intelligent_processor is None:
-        intelligent_processor = IntelligentTicketProcessor()
+        with _init_lock:
+            if intelligent_processor is None:
+                intelligent_processor = IntelligentTicketProcessor()
     return intelligent_processor
 
 # For testing
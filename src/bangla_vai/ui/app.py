@@ -194,7 +194,7 @@ def text_to_speech_via_api(text: str, slow: bool = False, return_file: bool = Fa
     except Exception as e:
         return False, f"Error during text-to-speech conversion: {str(e)}"
 
-def download_speech_file(timestamp: int):
+def download_speech_file(timestamp: str):
     """Download generated speech file by timestamp"""
     try:
         response = requests.get(
@@ -1045,8 +1045,8 @@ def main():
                             with st.spinner("🎯 Processing your voice complaint..."):
                                 try:
                                     # Save uploaded file temporarily
-                                    voices_dir = Path("voices")
-                                    voices_dir.mkdir(exist_ok=True)
+                                    voices_dir = Path(settings.VOICES_DIR)
+                                    voices_dir.mkdir(parents=True, exist_ok=True)
                                     
                                     timestamp = int(time.time())
                                     file_extension = uploaded_file.name.split(".")[-1] if "." in uploaded_file.name else "wav"
@@ -1167,7 +1167,7 @@ def main():
                 st.write("")  # Add some space
                 if st.button("🔄 Check for New Recording", help="Click after recording to check for saved audio"):
                     # Check for latest recorded file
-                    voices_dir = Path("voices")
+                    voices_dir = Path(settings.VOICES_DIR)
                     if voices_dir.exists():
                         recorded_files = list(voices_dir.glob("bengali_complaint_*.wav"))
                         if recorded_files:
@@ -1185,7 +1185,7 @@ def main():
             st.subheader("📝 Recording Actions")
 
             # Simple recording status check - NO AUTO-UPDATES
-            voices_dir = Path("voices")
+            voices_dir = Path(settings.VOICES_DIR)
             recorded_files = []
             latest_file = None
 
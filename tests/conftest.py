@@ -3,10 +3,11 @@ import os
 import tempfile
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import StaticPool, NullPool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
 # Import from our new structure
-from src.bangla_vai.core.database import Base, get_db, Ticket
+from src.bangla_vai.core.database import Base, get_db, get_async_db, get_ticket_batcher, Ticket, TicketInsertBatcher
 from src.bangla_vai.core.config import Settings
 from src.bangla_vai.api.main import app
 
@@ -24,12 +25,15 @@ def test_settings():
     """Provide test settings"""
     return TestSettings()
 
+# Shared-cache in-memory SQLite database, reachable from both the sync and async engines
+TEST_DB_URI = "file:bangla_vai_test?mode=memory&cache=shared&uri=true"
+
 @pytest.fixture(scope="function")
 def test_db():
     """Create a test database for each test"""
     # Create in-memory SQLite database
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{TEST_DB_URI}",
         connect_args={
             "check_same_thread": False,
         },
@@ -47,17 +51,43 @@ def test_db():
         yield session
     finally:
         session.close()
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+@pytest.fixture(scope="function")
+def test_async_session_factory(test_db):
+    """Async session factory on the test database"""
+    # NullPool: the test client runs its own event loop, so connections are not reused across loops
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DB_URI}", poolclass=NullPool)
+    return async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
 
 @pytest.fixture(scope="function")
-def override_get_db(test_db):
-    """Override the get_db dependency for testing"""
+def override_get_db(test_db, test_async_session_factory):
+    """Override the get_db, get_async_db and get_ticket_batcher dependencies for testing"""
     def _override_get_db():
         try:
             yield test_db
         finally:
             pass
     
+    TestingAsyncSessionLocal = test_async_session_factory
+    
+    async def _override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+    
+    async def _override_get_ticket_batcher():
+        # Same batched INSERT ... RETURNING path as production, writing to the test database
+        batcher = TicketInsertBatcher(session_factory=TestingAsyncSessionLocal)
+        batcher.start()
+        try:
+            yield batcher
+        finally:
+            await batcher.stop()
+    
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
+    app.dependency_overrides[get_ticket_batcher] = _override_get_ticket_batcher
     yield
     app.dependency_overrides.clear()
 
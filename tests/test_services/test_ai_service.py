@@ -0,0 +1,68 @@
+"""
+Unit tests for the Gemini response parsing helpers
+
+Run with: pytest tests/test_services/test_ai_service.py
+"""
+
+from src.bangla_vai.services.ai_service import _extract_json_object, _load_json_object
+
+
+# ----------------------------------------------------------------------------
+# _extract_json_object
+# ----------------------------------------------------------------------------
+
+def test_extracts_object_from_surrounding_prose():
+    text = 'Here is the analysis: {"category": "billing"} Let me know if you need more.'
+    assert _extract_json_object(text) == '{"category": "billing"}'
+
+
+def test_stops_at_first_balanced_object():
+    text = '{"a": {"b": [1, {"c": 2}]}} and then {"d": 3}'
+    assert _extract_json_object(text) == '{"a": {"b": [1, {"c": 2}]}}'
+
+
+def test_ignores_braces_inside_strings():
+    text = '{"title": "Router {model X} fails }", "key_points": ["{"]} trailing }'
+    assert _extract_json_object(text) == '{"title": "Router {model X} fails }", "key_points": ["{"]}'
+
+
+def test_ignores_escaped_quotes_inside_strings():
+    text = r'{"title": "He said \"}\" twice", "n": 1} tail'
+    assert _extract_json_object(text) == r'{"title": "He said \"}\" twice", "n": 1}'
+
+
+def test_extracts_arrays():
+    text = 'Steps: [1, [2, 3], "]"] done'
+    assert _extract_json_object(text, "[", "]") == '[1, [2, 3], "]"]'
+
+
+def test_no_object_returns_none():
+    assert _extract_json_object("no json here") is None
+    assert _extract_json_object("") is None
+
+
+def test_unterminated_object_falls_back_to_greedy_match():
+    # Truncated output: the outer object never closes, so the span up to the last brace is returned
+    assert _extract_json_object('Result: {"a": {"b": 1} and more') == '{"a": {"b": 1}'
+
+
+def test_unterminated_object_without_closing_brace_returns_none():
+    assert _extract_json_object('Result: {"a": 1') is None
+
+
+# ----------------------------------------------------------------------------
+# _load_json_object
+# ----------------------------------------------------------------------------
+
+def test_load_parses_whole_response():
+    assert _load_json_object('{"priority": "high"}') == {"priority": "high"}
+
+
+def test_load_parses_object_embedded_in_prose():
+    assert _load_json_object('```json\n{"priority": "high"}\n```') == {"priority": "high"}
+
+
+def test_load_rejects_non_objects_and_broken_json():
+    assert _load_json_object("[1, 2]") is None
+    assert _load_json_object('Result: {"a": {"b": 1} and more') is None
+    assert _load_json_object("plain text") is None
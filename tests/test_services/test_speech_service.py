@@ -0,0 +1,133 @@
+"""
+Unit tests for the speech service helpers: chunk merging and the STT circuit breaker
+
+Run with: pytest tests/test_services/test_speech_service.py
+"""
+
+import pytest
+
+from src.bangla_vai.services import speech_service
+from src.bangla_vai.services.speech_service import CircuitBreaker, merge_chunk_transcriptions
+
+
+def word(text: str, start: float, end: float) -> dict:
+    return {"text": text, "start": start, "end": end, "type": "word"}
+
+
+# ----------------------------------------------------------------------------
+# merge_chunk_transcriptions
+# ----------------------------------------------------------------------------
+
+def test_overlap_words_are_kept_once_by_the_owning_chunk():
+    # chunk_sec=10, overlap=1: chunk 0 covers [0, 11], chunk 1 covers [9, 21] (timestamps relative to 9)
+    chunk_results = [
+        {"language_code": "ben", "language_probability": 0.9,
+         "words": [word("a", 1.0, 2.0), word("b", 9.5, 10.3), word("c", 10.2, 10.8)]},
+        {"language_code": "ben", "language_probability": 0.8,
+         "words": [word("b", 0.5, 1.3), word("c", 1.2, 1.8), word("d", 5.0, 6.0)]},
+    ]
+
+    merged = merge_chunk_transcriptions(chunk_results, [0.0, 10.0], chunk_sec=10.0, overlap=1.0)
+
+    assert [w["text"] for w in merged["words"]] == ["a", "b", "c", "d"]
+    # Chunk 1 timestamps are shifted onto the recording's timeline
+    assert merged["words"][2]["start"] == pytest.approx(10.2)
+    assert merged["words"][3]["end"] == pytest.approx(15.0)
+    assert merged["text"] == "ab cd"
+    assert merged["chunks"] == 2
+
+
+def test_word_centred_on_the_boundary_belongs_to_the_next_chunk():
+    chunk_results = [
+        {"words": [word("x", 9.5, 10.5)]},
+        {"words": [word("x", 0.5, 1.5)]},
+    ]
+
+    merged = merge_chunk_transcriptions(chunk_results, [0.0, 10.0], chunk_sec=10.0, overlap=1.0)
+
+    assert len(merged["words"]) == 1
+    assert merged["words"][0]["start"] == pytest.approx(9.5)
+
+
+def test_chunks_without_words_fall_back_to_their_text():
+    chunk_results = [
+        {"language_code": "ben", "language_probability": 0.95, "text": " first part "},
+        {"language_code": "ben", "language_probability": 0.7, "text": "second part"},
+    ]
+
+    merged = merge_chunk_transcriptions(chunk_results, [0.0, 10.0], chunk_sec=10.0, overlap=1.0)
+
+    assert merged["text"] == "first part second part"
+    assert merged["words"] == []
+    assert merged["language_code"] == "ben"
+    # The least confident chunk sets the overall probability
+    assert merged["language_probability"] == pytest.approx(0.7)
+
+
+# ----------------------------------------------------------------------------
+# CircuitBreaker
+# ----------------------------------------------------------------------------
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for the breaker"""
+    now = [1000.0]
+    monkeypatch.setattr(speech_service.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=30.0)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.allow_request()
+
+
+def test_half_open_lets_a_single_trial_through(clock):
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=30.0)
+    breaker.record_failure()
+
+    clock[0] += 29.0
+    assert not breaker.allow_request()
+    clock[0] += 1.0
+    assert breaker.allow_request()
+    # The trial is in flight: everything else is still rejected
+    assert not breaker.allow_request()
+
+
+def test_successful_trial_closes_the_breaker(clock):
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=30.0)
+    breaker.record_failure()
+    clock[0] += 30.0
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_failed_trial_reopens_for_another_timeout(clock):
+    breaker = CircuitBreaker(fail_max=1, reset_timeout=30.0)
+    breaker.record_failure()
+    clock[0] += 30.0
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    clock[0] += 29.0
+    assert not breaker.allow_request()
+    clock[0] += 1.0
+    assert breaker.allow_request()
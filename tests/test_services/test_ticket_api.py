@@ -0,0 +1,220 @@
+"""
+Async API tests for the ticket endpoints and the insert batcher
+
+Run with: pytest tests/test_services/test_ticket_api.py
+"""
+
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.bangla_vai.api.main import app
+from src.bangla_vai.core.database import TicketCategory, TicketInsertBatcher, TicketPriority, TicketStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+def api_client() -> AsyncClient:
+    """Async client calling the app in-process (no lifespan, dependencies overridden by conftest)"""
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+async def create_ticket(client: AsyncClient, data: dict, **changes) -> dict:
+    response = await client.post("/tickets/create", json={**data, **changes})
+    assert response.status_code == 200, response.text
+    return response.json()["ticket"]
+
+
+def ticket_values(title: str) -> dict:
+    """Column values as the API passes them to the batcher"""
+    return {
+        "title": title,
+        "description": "Batched ticket",
+        "customer_name": "Batch Customer",
+        "status": TicketStatus.OPEN,
+        "priority": TicketPriority.MEDIUM,
+        "category": TicketCategory.GENERAL,
+    }
+
+
+def started_batcher(session_factory, **options) -> TicketInsertBatcher:
+    batcher = TicketInsertBatcher(session_factory=session_factory, **options)
+    batcher.start()
+    if not batcher.running:
+        pytest.skip("Database driver cannot RETURNING from a multi-row insert")
+    return batcher
+
+
+# ----------------------------------------------------------------------------
+# GET /tickets/stats
+# ----------------------------------------------------------------------------
+
+async def test_stats_on_empty_database(override_get_db):
+    async with api_client() as client:
+        response = await client.get("/tickets/stats")
+
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    assert stats["total_tickets"] == 0
+    assert set(stats["by_status"].values()) == {0}
+    assert set(stats["by_priority"].values()) == {0}
+    assert set(stats["by_category"].values()) == {0}
+
+
+async def test_stats_fold_grouped_counts(override_get_db, sample_ticket_data):
+    async with api_client() as client:
+        await create_ticket(client, sample_ticket_data, category="technical", priority="medium")
+        await create_ticket(client, sample_ticket_data, category="billing", priority="urgent")
+        resolved = await create_ticket(client, sample_ticket_data, category="billing", priority="high")
+        await client.put(f"/tickets/{resolved['id']}", json={"status": "resolved"})
+
+        response = await client.get("/tickets/stats")
+
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    assert stats["total_tickets"] == 3
+    assert stats["open_tickets"] == 2
+    assert stats["resolved_tickets"] == 1
+    assert stats["in_progress_tickets"] == 0
+    assert stats["urgent_tickets"] == 1
+    assert stats["high_priority_tickets"] == 1
+    assert stats["by_category"]["billing"] == 2
+    assert stats["by_category"]["technical"] == 1
+    assert stats["by_category"]["general"] == 0
+    assert stats["by_status"]["processing"] == 0
+
+
+# ----------------------------------------------------------------------------
+# GET /tickets (window-count paging)
+# ----------------------------------------------------------------------------
+
+async def test_list_pages_report_filtered_total(override_get_db, sample_ticket_data):
+    async with api_client() as client:
+        for i in range(5):
+            await create_ticket(client, sample_ticket_data, title=f"Ticket {i}")
+
+        first = (await client.get("/tickets", params={"limit": 2, "offset": 0})).json()
+        last = (await client.get("/tickets", params={"limit": 2, "offset": 4})).json()
+
+    assert len(first["tickets"]) == 2
+    assert first["total"] == 5
+    assert len(last["tickets"]) == 1
+    assert last["total"] == 5
+
+
+async def test_list_offset_past_end_still_counts(override_get_db, sample_ticket_data):
+    async with api_client() as client:
+        for i in range(3):
+            await create_ticket(client, sample_ticket_data, title=f"Ticket {i}")
+
+        page = (await client.get("/tickets", params={"limit": 10, "offset": 10})).json()
+
+    assert page["tickets"] == []
+    assert page["total"] == 3
+    assert page["offset"] == 10
+
+
+async def test_list_total_respects_filters(override_get_db, sample_ticket_data):
+    async with api_client() as client:
+        await create_ticket(client, sample_ticket_data, category="billing")
+        await create_ticket(client, sample_ticket_data, category="billing")
+        await create_ticket(client, sample_ticket_data, category="technical")
+
+        page = (await client.get("/tickets", params={"category": "billing", "limit": 1})).json()
+        empty = (await client.get("/tickets", params={"category": "general"})).json()
+
+    assert len(page["tickets"]) == 1
+    assert page["total"] == 2
+    assert empty == {"tickets": [], "total": 0, "limit": 10, "offset": 0}
+
+
+# ----------------------------------------------------------------------------
+# PUT /tickets/{id} (UPDATE ... RETURNING)
+# ----------------------------------------------------------------------------
+
+async def test_update_returns_updated_row(override_get_db, sample_ticket_data):
+    async with api_client() as client:
+        ticket = await create_ticket(client, sample_ticket_data)
+        response = await client.put(
+            f"/tickets/{ticket['id']}",
+            json={"status": "resolved", "assigned_to": "Support Agent"}
+        )
+        fetched = (await client.get(f"/tickets/{ticket['id']}")).json()
+
+    assert response.status_code == 200, response.text
+    updated = response.json()["ticket"]
+    assert updated["id"] == ticket["id"]
+    assert updated["status"] == "resolved"
+    assert updated["assigned_to"] == "Support Agent"
+    assert updated["resolved_at"] is not None
+    # Fields not in the request are left alone
+    assert updated["title"] == sample_ticket_data["title"]
+    assert fetched["status"] == "resolved"
+
+
+async def test_update_missing_ticket_returns_404(override_get_db):
+    async with api_client() as client:
+        response = await client.put("/tickets/9999", json={"title": "Nothing here"})
+
+    assert response.status_code == 404
+
+
+# ----------------------------------------------------------------------------
+# TicketInsertBatcher
+# ----------------------------------------------------------------------------
+
+async def test_batcher_coalesces_concurrent_inserts(test_async_session_factory):
+    sessions = []
+
+    def session_factory():
+        sessions.append(1)
+        return test_async_session_factory()
+
+    batcher = started_batcher(session_factory, window=0.05)
+    try:
+        rows = await asyncio.gather(*(batcher.submit(ticket_values(f"Ticket {i}")) for i in range(5)))
+    finally:
+        await batcher.stop()
+
+    # One session (one transaction) for the whole batch, each caller gets its own row back
+    assert len(sessions) == 1
+    assert [row.title for row in rows] == [f"Ticket {i}" for i in range(5)]
+    assert len({row.id for row in rows}) == 5
+
+
+async def test_batcher_retries_failed_batch_item_by_item(test_async_session_factory):
+    sessions = []
+
+    def session_factory():
+        sessions.append(1)
+        return test_async_session_factory()
+
+    batcher = started_batcher(session_factory, window=0.05)
+    try:
+        results = await asyncio.gather(
+            batcher.submit(ticket_values("Good 1")),
+            batcher.submit(ticket_values(None)),  # title is NOT NULL
+            batcher.submit(ticket_values("Good 2")),
+            return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+    # The failed batch, then one retry per item: only the bad row fails
+    assert len(sessions) == 4
+    assert results[0].title == "Good 1"
+    assert isinstance(results[1], Exception)
+    assert results[2].title == "Good 2"
+
+
+async def test_batcher_stop_flushes_queued_inserts(test_async_session_factory):
+    batcher = started_batcher(test_async_session_factory, window=0.05)
+    submits = [asyncio.create_task(batcher.submit(ticket_values(f"Ticket {i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+    await batcher.stop()
+
+    rows = await asyncio.gather(*submits)
+    assert [row.title for row in rows] == ["Ticket 0", "Ticket 1", "Ticket 2"]
+    with pytest.raises(RuntimeError):
+        await batcher.submit(ticket_values("Too late"))